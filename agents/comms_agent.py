@@ -6,11 +6,98 @@ lightweight Slack webhook integration is provided as an example for the
 SMTP fallbacks.
 """
 
+import atexit
+import mmap
 import os
 import re
+import threading
+from typing import Any, Dict, Tuple
 
 from logger import log
 
+_EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+MMAP_THRESHOLD = 1_000_000
+
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 587
+
+# Authenticated SMTP sessions keyed by (host, port, user).  Reusing them skips
+# the TCP, STARTTLS and AUTH round-trips on every email.
+_smtp_pool: Dict[Tuple[str, int, str], Any] = {}
+_smtp_lock = threading.Lock()
+
+
+def _smtp_connection(smtp_user: str, password: str):
+    """Return a live SMTP session for ``smtp_user``, reconnecting if needed.
+
+    Must be called with ``_smtp_lock`` held.
+    """
+    import smtplib
+
+    key = (SMTP_HOST, SMTP_PORT, smtp_user)
+    server = _smtp_pool.get(key)
+    if server is not None:
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            pass
+        _drop_smtp(key)
+
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+    server.starttls()
+    server.login(smtp_user, password)
+    _smtp_pool[key] = server
+    return server
+
+
+def _drop_smtp(key: Tuple[str, int, str]) -> None:
+    server = _smtp_pool.pop(key, None)
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        pass
+
+
+def _close_smtp_pool() -> None:
+    """Close every pooled SMTP session."""
+    with _smtp_lock:
+        for key in list(_smtp_pool):
+            _drop_smtp(key)
+
+
+atexit.register(_close_smtp_pool)
+
+
+def _attach_file(msg, path: str) -> None:
+    """Attach ``path`` to ``msg`` as ``application/octet-stream``.
+
+    Files above ``MMAP_THRESHOLD`` bytes are memory-mapped and encoded
+    straight from the page cache instead of being read into a bytes copy.
+    """
+    filename = os.path.basename(path)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    msg.add_attachment(
+                        view,
+                        maintype="application",
+                        subtype="octet-stream",
+                        filename=filename,
+                    )
+            return
+        data = f.read()
+    msg.add_attachment(
+        data,
+        maintype="application",
+        subtype="octet-stream",
+        filename=filename,
+    )
+
 
 def send_message(destination: str, message: str, user: str = "") -> bool:
     """Send a message to a generic destination.
@@ -48,9 +135,10 @@ def send_email(to: str, subject: str, attachment: str, user: str = "") -> bool:
     """Send an email with an attachment.
 
     Attempts to use Outlook via ``win32com.client``. If Outlook is not
-    available, falls back to a minimal SMTP example (Gmail). Environment
-    variables ``GMAIL_USER`` and ``GMAIL_PASS`` should contain credentials for
-    the SMTP fallback.
+    available, falls back to a minimal SMTP example (Gmail) whose
+    authenticated connection is kept open and reused by later calls.
+    Environment variables ``GMAIL_USER`` and ``GMAIL_PASS`` should contain
+    credentials for the SMTP fallback.
 
     Parameters
     ----------
@@ -71,13 +159,9 @@ def send_email(to: str, subject: str, attachment: str, user: str = "") -> bool:
 
     log(f"Preparing email to {to} with {attachment}")
 
-    if not re.match(r"[^@]+@[^@]+\.[^@]+", to):
+    if not _EMAIL_RE.match(to):
         log("Invalid recipient address", "ERROR")
         return False
-    if attachment and not os.path.exists(attachment):
-        log("Attachment not found", "ERROR")
-        return False
-
     # Try Outlook first
     try:
         import win32com.client  # type: ignore
@@ -87,7 +171,7 @@ def send_email(to: str, subject: str, attachment: str, user: str = "") -> bool:
         mail.To = to
         mail.Subject = subject
         mail.Body = "Please see attached."
-        if attachment and os.path.exists(attachment):
+        if attachment:
             mail.Attachments.Add(attachment)
         mail.Send()
         log("Email sent via Outlook")
@@ -97,35 +181,33 @@ def send_email(to: str, subject: str, attachment: str, user: str = "") -> bool:
 
     # SMTP fallback
     try:
-        import smtplib
         from email.message import EmailMessage
 
+        msg = EmailMessage()
+        msg["To"] = to
+        msg["Subject"] = subject
+        msg.set_content("Please see attached.")
+
+        if attachment:
+            try:
+                _attach_file(msg, attachment)
+            except FileNotFoundError:
+                log("Attachment not found", "ERROR")
+                return False
+
         smtp_user = os.environ.get("GMAIL_USER")
         password = os.environ.get("GMAIL_PASS")
         if not smtp_user or not password:
             raise RuntimeError("SMTP credentials not configured")
-
-        msg = EmailMessage()
         msg["From"] = smtp_user
-        msg["To"] = to
-        msg["Subject"] = subject
-        msg.set_content("Please see attached.")
 
-        if attachment and os.path.exists(attachment):
-            with open(attachment, "rb") as f:
-                data = f.read()
-            msg.add_attachment(
-                data,
-                maintype="application",
-                subtype="octet-stream",
-                filename=os.path.basename(attachment),
-            )
-
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(smtp_user, password)
-        server.send_message(msg)
-        server.quit()
+        with _smtp_lock:
+            server = _smtp_connection(smtp_user, password)
+            try:
+                server.send_message(msg)
+            except Exception:
+                _drop_smtp((SMTP_HOST, SMTP_PORT, smtp_user))
+                raise
         log("Email sent via SMTP")
         return True
     except Exception as exc:
@@ -5,19 +5,25 @@ well as helper utilities used by the planner, such as locating the most
 recent screenshot or redacting names from an image.
 """
 
-import glob
+import atexit
+import functools
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from logger import log
 from file_indexer import search_index
 
-import pytesseract
-from PIL import Image, ImageFilter
-import spacy
+_BLUR_RADIUS = 8
+_IMAGE_EXT = (".png", ".jpg", ".jpeg")
+_OCR_DOWNSCALE_MIN = 2000
+_PUNCT = str.maketrans("", "", ".,:;!?")
 
-from utils.ocr import extract_text
+# Lazily created tesserocr API; Tesseract instances are not thread-safe.
+_TESS_API = None
+_TESS_LOCK = threading.Lock()
 
 
 def read_text(path: str, user: str = "") -> Optional[str]:
@@ -42,6 +48,24 @@ def find_by_keywords(keywords: List[str], filetype: Optional[str] = None, user:
     return matches
 
 
+def _scan_screenshots(directory: Path) -> List[Tuple[float, str]]:
+    """Return ``(mtime, path)`` for screenshot images directly in ``directory``."""
+    found: List[Tuple[float, str]] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                name = entry.name.lower()
+                if "screenshot" not in name or not name.endswith(_IMAGE_EXT):
+                    continue
+                try:
+                    found.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return found
+
+
 def find_recent_screenshot(user: str = "") -> str:
     """Find the most recent screenshot in common folders.
 
@@ -64,39 +88,149 @@ def find_recent_screenshot(user: str = "") -> str:
     log("Searching for recent screenshot")
     home = Path.home()
     search_dirs = [home / "Downloads", home / "Pictures", home / "Desktop"]
-    candidates = []
+    candidates: List[Tuple[float, str]] = []
 
-    for directory in search_dirs:
-        if not directory.exists():
-            continue
-        for ext in ("*.png", "*.jpg", "*.jpeg"):
-            for path in directory.glob(ext):
-                if "screenshot" in path.name.lower():
-                    candidates.append(path)
+    # The folders may live on slow or network storage, so scan them
+    # concurrently rather than one after another.
+    with ThreadPoolExecutor(max_workers=len(search_dirs)) as pool:
+        for found in pool.map(_scan_screenshots, search_dirs):
+            candidates.extend(found)
 
     if not candidates:
         log("No screenshots found in common folders", "INFO")
         matches = search_index(["screenshot"], None)
         for m in matches:
-            if m.lower().endswith(('.png', '.jpg', '.jpeg')):
-                candidates.append(Path(m))
+            if m.lower().endswith(_IMAGE_EXT):
+                try:
+                    candidates.append((os.stat(m).st_mtime, m))
+                except OSError:
+                    continue
         if not candidates:
             raise FileNotFoundError("No screenshot found in common folders")
 
-    latest = max(candidates, key=lambda p: p.stat().st_mtime)
-    latest_path = str(latest.resolve())
+    latest = max(candidates)[1]
+    latest_path = str(Path(latest).resolve())
     log(f"Found screenshot: {latest_path}")
     return latest_path
 
 
+def _merge_boxes(boxes: List[Tuple[int, int, int, int]], gap: int = 0) -> List[Tuple[int, int, int, int]]:
+    """Union overlapping ``(left, top, right, bottom)`` boxes.
+
+    Boxes closer than ``gap`` pixels are merged as well so that adjacent name
+    tokens are blurred with a single filter call.
+    """
+    merged: List[Tuple[int, int, int, int]] = []
+    for box in sorted(boxes):
+        x0, y0, x1, y1 = box
+        i = 0
+        while i < len(merged):
+            mx0, my0, mx1, my1 = merged[i]
+            if x0 <= mx1 + gap and mx0 <= x1 + gap and y0 <= my1 + gap and my0 <= y1 + gap:
+                x0, y0, x1, y1 = min(x0, mx0), min(y0, my0), max(x1, mx1), max(y1, my1)
+                merged.pop(i)
+                i = 0
+            else:
+                i += 1
+        merged.append((x0, y0, x1, y1))
+    return merged
+
+
+def _ocr_words(img) -> dict:
+    """Return word boxes for ``img`` in ``pytesseract.image_to_data`` layout.
+
+    When ``tesserocr`` is installed a single ``PyTessBaseAPI`` is kept alive
+    and reused, which avoids spawning Tesseract and reloading its language
+    data for every image. Otherwise ``pytesseract`` is used.
+    """
+    # Tesseract's OpenMP threading slows down single-image OCR. Set before
+    # tesserocr is loaded and inherited by pytesseract's subprocess.
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    try:
+        from tesserocr import PyTessBaseAPI, RIL, iterate_level
+    except ImportError:
+        import pytesseract
+
+        return pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+
+    global _TESS_API
+    data: dict = {"text": [], "left": [], "top": [], "width": [], "height": []}
+    with _TESS_LOCK:
+        if _TESS_API is None:
+            _TESS_API = PyTessBaseAPI(lang="eng")
+            atexit.register(_TESS_API.End)
+        api = _TESS_API
+        api.SetImage(img)
+        api.Recognize()
+        for word in iterate_level(api.GetIterator(), RIL.WORD):
+            text = word.GetUTF8Text(RIL.WORD)
+            box = word.BoundingBox(RIL.WORD)
+            if text is None or box is None:
+                continue
+            x0, y0, x1, y1 = box
+            data["text"].append(text)
+            data["left"].append(x0)
+            data["top"].append(y0)
+            data["width"].append(x1 - x0)
+            data["height"].append(y1 - y0)
+    return data
+
+
+def _blur_regions(pil_img, boxes: List[Tuple[int, int, int, int]]):
+    """Gaussian-blur each ``(left, top, right, bottom)`` box of ``pil_img``.
+
+    OpenCV's vectorised kernel is used in place on a NumPy view of the image
+    when ``cv2`` is installed; otherwise PIL's ``GaussianBlur`` is applied
+    per box.
+    """
+    if not boxes:
+        return pil_img
+    try:
+        import cv2
+        import numpy as np
+    except ImportError:
+        cv2 = None
+
+    if cv2 is not None and pil_img.mode in ("L", "RGB", "RGBA"):
+        from PIL import Image
+
+        arr = np.array(pil_img)
+        for x0, y0, x1, y1 in boxes:
+            tile = arr[y0:y1, x0:x1]
+            if tile.size:
+                arr[y0:y1, x0:x1] = cv2.GaussianBlur(
+                    tile, (0, 0), sigmaX=_BLUR_RADIUS, sigmaY=_BLUR_RADIUS
+                )
+        return Image.fromarray(arr)
+
+    from PIL import ImageFilter
+
+    for box in boxes:
+        region = pil_img.crop(box).filter(ImageFilter.GaussianBlur(radius=_BLUR_RADIUS))
+        pil_img.paste(region, box[:2])
+    return pil_img
+
+
+@functools.lru_cache(maxsize=1)
+def _get_nlp():
+    """Load the spaCy English model once, keeping only what NER needs."""
+    import spacy
+
+    return spacy.load(
+        "en_core_web_sm",
+        disable=["tagger", "parser", "lemmatizer", "attribute_ruler"],
+    )
+
+
 def redact_names(image_path: str, user: str = "") -> str:
     """Detect and blur names in an image.
 
-    This function performs OCR on ``image_path`` using ``pytesseract`` and
-    runs the text through the small spaCy English model to locate ``PERSON``
-    entities. Bounding boxes corresponding to detected name tokens are blurred
-    with a Gaussian filter. A new image prefixed with ``redacted_`` is saved in
-    the same directory and its path is returned.
+    This function performs a single OCR pass on ``image_path`` (through
+    ``tesserocr`` or ``pytesseract``) and runs the recognised words through the
+    small spaCy English model to locate ``PERSON`` entities. Bounding boxes
+    corresponding to detected name tokens are merged and blurred with a
+    Gaussian filter. A new image prefixed with ``redacted_`` is saved in the
+    same directory and its path is returned.
 
     Parameters
     ----------
@@ -111,16 +245,31 @@ def redact_names(image_path: str, user: str = "") -> str:
         Path to the redacted image file.
     """
 
+    from PIL import Image
+
     log(f"Redacting names in {image_path}")
 
+    pil_img = Image.open(image_path)
+    # OCR cost grows with pixel count, so very large screenshots are read at
+    # half resolution; the boxes are scaled back up for the blur.
+    scale = 2 if min(pil_img.size) > _OCR_DOWNSCALE_MIN else 1
+    if scale > 1:
+        ocr_img = pil_img.resize((pil_img.width // scale, pil_img.height // scale), Image.BILINEAR)
+    else:
+        ocr_img = pil_img
     try:
-        text = extract_text(image_path) or ""
+        data = _ocr_words(ocr_img)
+        tokens = data.get("text", [])
     except Exception as e:
-        log(f"Failed to extract text: {e}", "ERROR")
-        text = ""
+        log(f"OCR data extraction failed: {e}", "ERROR")
+        data = {}
+        tokens = []
+
+    # Reuse the word boxes for the spaCy input instead of running OCR twice.
+    text = " ".join(w for w in tokens if w.strip())
 
     try:
-        nlp = spacy.load("en_core_web_sm")
+        nlp = _get_nlp()
         doc = nlp(text)
         names = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
     except Exception as e:
@@ -131,29 +280,22 @@ def redact_names(image_path: str, user: str = "") -> str:
         log("No names detected; copying image")
         p = Path(image_path)
         out_path = p.with_name(f"redacted_{p.stem}.png")
-        Image.open(image_path).save(out_path)
+        pil_img.save(out_path)
         return str(out_path)
 
-    try:
-        pil_img = Image.open(image_path)
-        data = pytesseract.image_to_data(pil_img, output_type=pytesseract.Output.DICT)
-        tokens = data.get("text", [])
-    except Exception as e:
-        log(f"OCR data extraction failed: {e}", "ERROR")
-        tokens = []
-
-    name_tokens = {w.lower() for n in names for w in n.split()}
+    name_tokens = {w.translate(_PUNCT).lower() for n in names for w in n.split()}
 
+    boxes = []
     for i, word in enumerate(tokens):
-        cleaned = word.strip().strip('.,:;!?').lower()
+        cleaned = word.translate(_PUNCT).strip().lower()
         if not cleaned:
             continue
         if cleaned in name_tokens:
             x, y = data["left"][i], data["top"][i]
             w, h = data["width"][i], data["height"][i]
-            region = pil_img.crop((x, y, x + w, y + h))
-            region = region.filter(ImageFilter.GaussianBlur(radius=8))
-            pil_img.paste(region, (x, y))
+            boxes.append((x * scale, y * scale, (x + w) * scale, (y + h) * scale))
+
+    pil_img = _blur_regions(pil_img, _merge_boxes(boxes, gap=_BLUR_RADIUS))
 
     p = Path(image_path)
     redacted_path = p.with_name(f"redacted_{p.stem}.png")
@@ -6,6 +6,11 @@ mouse and keyboard control but falls back gracefully if it is not
 available (for instance on headless systems).
 """
 
+try:
+    import pyautogui as _pg
+except Exception:  # pragma: no cover - environment specific
+    _pg = None
+
 
 def click(x: int, y: int) -> None:
     """Simulate a mouse click at the given coordinates.
@@ -17,10 +22,11 @@ def click(x: int, y: int) -> None:
     """
 
     print(f"[UI] Click at ({x}, {y})")
+    if _pg is None:
+        print("[UI] Click failed: pyautogui unavailable")
+        return
     try:
-        import pyautogui
-
-        pyautogui.click(x=x, y=y)
+        _pg.click(x=x, y=y)
     except Exception as exc:  # pragma: no cover - environment specific
         print(f"[UI] Click failed: {exc}")
 
@@ -35,9 +41,10 @@ def type_text(text: str) -> None:
     """
 
     print(f"[UI] Typing: {text}")
+    if _pg is None:
+        print("[UI] Type failed: pyautogui unavailable")
+        return
     try:
-        import pyautogui
-
-        pyautogui.write(text)
+        _pg.write(text)
     except Exception as exc:  # pragma: no cover - environment specific
         print(f"[UI] Type failed: {exc}")
@@ -1,7 +1,12 @@
 """Bridge server exposing HTTP endpoints for the React UI."""
 
-from flask import Flask, request, jsonify
+import atexit
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from flask import Flask, request, jsonify
 import webbrowser
 from logger import log
 from main import run_plan_direct, run_goal
@@ -10,6 +15,62 @@ from memory import list_users, get_recent_goals
 
 app = Flask(__name__, static_folder="react_frontend", static_url_path="")
 
+HOST = "127.0.0.1"
+PORT = 5169
+
+# Goals, plans and enrollment run in the background on a shared pool so that
+# bursts of requests reuse a fixed set of threads.
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bridge")
+atexit.register(_EXECUTOR.shutdown, wait=False)
+
+# Caps running plus queued jobs; further requests are answered with 503.
+MAX_PENDING = 16
+_PENDING = threading.BoundedSemaphore(MAX_PENDING)
+
+
+def _submit(fn: Callable[[], None]) -> bool:
+    """Queue ``fn`` on the worker pool, returning ``False`` when saturated."""
+    if not _PENDING.acquire(blocking=False):
+        return False
+    try:
+        future = _EXECUTOR.submit(fn)
+    except RuntimeError:
+        _PENDING.release()
+        return False
+    future.add_done_callback(lambda _f: _PENDING.release())
+    return True
+
+
+# Short-lived response caches for the polled read-only endpoints.  They are
+# cleared whenever a goal or plan finishes so new history shows up at once.
+HISTORY_TTL = 1.5
+USERS_TTL = 5.0
+_CACHE_MAX = 64
+_CACHE_LOCK = threading.Lock()
+_HISTORY_CACHE: Dict[Hashable, Tuple[float, Any]] = {}
+_USERS_CACHE: Dict[Hashable, Tuple[float, Any]] = {}
+
+
+def _cached(cache: Dict[Hashable, Tuple[float, Any]], key: Hashable, ttl: float, compute: Callable[[], Any]) -> Any:
+    """Return ``compute()`` memoised in ``cache`` for ``ttl`` seconds."""
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        hit = cache.get(key)
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+    value = compute()
+    with _CACHE_LOCK:
+        if len(cache) >= _CACHE_MAX:
+            cache.clear()
+        cache[key] = (now, value)
+    return value
+
+
+def _invalidate_caches() -> None:
+    with _CACHE_LOCK:
+        _HISTORY_CACHE.clear()
+        _USERS_CACHE.clear()
+
 
 @app.get("/")
 def index():
@@ -29,8 +90,11 @@ def receive_plan():
             run_plan_direct(plan_text, user=user, dry_run=dry_run)
         except Exception as exc:  # pragma: no cover - background errors
             log(f"Plan execution failed: {exc}", 'ERROR')
+        finally:
+            _invalidate_caches()
 
-    threading.Thread(target=_run, daemon=True).start()
+    if not _submit(_run):
+        return jsonify({'status': 'busy'}), 503
     return jsonify({'status': 'started'})
 
 
@@ -47,8 +111,11 @@ def receive_goal():
             run_goal(goal, dry_run=dry_run, user=user)
         except Exception as exc:  # pragma: no cover - background errors
             log(f"Goal execution failed: {exc}", 'ERROR')
+        finally:
+            _invalidate_caches()
 
-    threading.Thread(target=_run, daemon=True).start()
+    if not _submit(_run):
+        return jsonify({'status': 'busy'}), 503
     return jsonify({'status': 'started'})
 
 
@@ -62,14 +129,15 @@ def enroll_user():
         except Exception as exc:  # pragma: no cover - background errors
             log(f"Enrollment failed: {exc}", 'ERROR')
 
-    threading.Thread(target=_run, daemon=True).start()
+    if not _submit(_run):
+        return jsonify({'status': 'busy'}), 503
     return jsonify({'status': 'started'})
 
 
 @app.get('/users')
 def get_users():
     """Return list of known users."""
-    users = list_users()
+    users = list(_cached(_USERS_CACHE, None, USERS_TTL, list_users))
     if 'default' not in users:
         users.insert(0, 'default')
     return jsonify({'users': users})
@@ -80,7 +148,10 @@ def get_history():
     """Return recent goal history."""
     limit = int(request.args.get('limit', 5))
     user = request.args.get('user')
-    rows = get_recent_goals(limit, user)
+    rows = _cached(
+        _HISTORY_CACHE, (user, limit), HISTORY_TTL,
+        lambda: get_recent_goals(limit, user),
+    )
     history = [
         {'timestamp': ts, 'goal': g, 'result': r}
         for ts, g, r in rows
@@ -89,11 +160,21 @@ def get_history():
 
 
 def start_server(open_browser: bool = False) -> None:
-    """Start the bridge Flask server."""
-    log("Starting bridge server on port 5169")
+    """Start the bridge server.
+
+    Uses ``waitress`` when installed and falls back to Flask's threaded
+    development server otherwise.
+    """
+    log(f"Starting bridge server on port {PORT}")
     if open_browser:
-        webbrowser.open("http://localhost:5169", new=2)
-    app.run(port=5169)
+        webbrowser.open(f"http://localhost:{PORT}", new=2)
+    try:
+        from waitress import serve
+    except ImportError:
+        log("waitress not installed; using Flask development server", "WARNING")
+        app.run(host=HOST, port=PORT, threaded=True)
+        return
+    serve(app, host=HOST, port=PORT, threads=8)
 
 
 if __name__ == '__main__':
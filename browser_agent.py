@@ -1,29 +1,120 @@
 """Browser automation helpers using Playwright."""
 
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
 from typing import Dict, List
 
 from logger import log
 
+# Playwright's sync API is bound to the thread that started it, so one
+# dedicated worker thread owns the driver and the long-lived Chromium and
+# runs every browser task from a queue. ``_pw``/``_browser`` are only ever
+# touched on that thread.
+_JOBS: "queue.Queue" = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+_pw = None
+_browser = None
+
+
+def _get_browser():
+    """Return the shared Chromium instance, relaunching it if it has died."""
+    global _pw, _browser
+    if _browser is not None and _browser.is_connected():
+        return _browser
+
+    from playwright.sync_api import sync_playwright  # type: ignore
+
+    if _browser is not None:
+        try:
+            _browser.close()
+        except Exception:
+            pass
+        _browser = None
+    if _pw is None:
+        _pw = sync_playwright().start()
+    _browser = _pw.chromium.launch(headless=True)
+    return _browser
+
+
+def _close_browser() -> None:
+    """Close Chromium and stop the Playwright driver on the worker thread."""
+    global _pw, _browser
+    for obj, method in ((_browser, "close"), (_pw, "stop")):
+        if obj is not None:
+            try:
+                getattr(obj, method)()
+            except Exception:
+                pass
+    _pw = _browser = None
+
+
+def _worker_loop() -> None:
+    while True:
+        job = _JOBS.get()
+        if job is None:
+            _close_browser()
+            return
+        fn, args, future = job
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+
+def _submit(fn, *args) -> Future:
+    """Run ``fn(*args)`` on the browser thread, starting it on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, name="browser", daemon=True)
+            _worker.start()
+    future: Future = Future()
+    _JOBS.put((fn, args, future))
+    return future
+
+
+def _shutdown() -> None:
+    """Ask the browser thread to close Chromium and wait for it to finish."""
+    with _worker_lock:
+        worker = _worker
+    if worker is not None and worker.is_alive():
+        _JOBS.put(None)
+        worker.join(timeout=10)
+
+
+atexit.register(_shutdown)
+
 
 def run_browser_task(task: Dict) -> str:
     """Execute a list of browser actions using Playwright.
 
     ``task`` should contain a ``steps`` list with dictionaries describing
-    each action.
+    each action.  The Chromium process is kept alive between calls and each
+    task runs in its own fresh browser context; tasks from different threads
+    are run one after another on the browser thread.
     """
     log("Starting browser task", "WEB")
+    return _submit(_run_task, task).result()
+
+
+def _run_task(task: Dict) -> str:
     steps = task.get("steps", [])
     try:
-        from playwright.sync_api import sync_playwright  # type: ignore
+        browser = _get_browser()
     except Exception as exc:
         log(f"Playwright not available: {exc}", "ERROR")
         return "Browser automation unavailable"
 
     actions_log: List[str] = []
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        context = browser.new_context()
+        try:
+            page = context.new_page()
             for step in steps:
                 action = step.get("action")
                 if action == "go_to":
@@ -38,7 +129,8 @@ def run_browser_task(task: Dict) -> str:
                     actions_log.append(f"Filled {step.get('selector')}")
                 else:
                     actions_log.append(f"Unknown action {action}")
-            browser.close()
+        finally:
+            context.close()
         log("Browser task complete", "WEB")
         return "; ".join(actions_log)
     except Exception as exc:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 import tempfile
@@ -20,8 +21,18 @@ CONFIG_FILE = Path(".ghosthand_lock.json")
 VOICE_DIR = Path("voiceprints")
 
 
+_KEY = SECRET_KEY.encode()
+
+
+@functools.lru_cache(maxsize=4)
 def _hmac(data: bytes) -> str:
-    return hmac.new(SECRET_KEY.encode(), data, hashlib.sha256).hexdigest()
+    return hmac.new(_KEY, data, hashlib.sha256).hexdigest()
+
+
+def _fingerprint(cfg: dict) -> str:
+    # The serialisation must stay byte-for-byte stable: existing lock files
+    # were signed with json.dumps' default separators.
+    return _hmac(json.dumps(cfg, sort_keys=True).encode())
 
 
 def initialize_core() -> None:
@@ -37,7 +48,7 @@ def initialize_core() -> None:
             "enrolled_user": "william",
             "system_id": uuid.getnode(),
         }
-        fingerprint = _hmac(json.dumps(cfg, sort_keys=True).encode())
+        fingerprint = _fingerprint(cfg)
         cfg["fingerprint"] = fingerprint
         CONFIG_FILE.write_text(json.dumps(cfg))
         os.chmod(CONFIG_FILE, 0o400)
@@ -54,7 +65,7 @@ def verify_integrity() -> None:
     fingerprint = cfg.get("fingerprint", "")
     tmp = cfg.copy()
     tmp.pop("fingerprint", None)
-    check = _hmac(json.dumps(tmp, sort_keys=True).encode())
+    check = _fingerprint(tmp)
     if not hmac.compare_digest(fingerprint, check):
         log_tamper("fingerprint mismatch")
         raise RuntimeError("Integrity check failed")
@@ -2,8 +2,9 @@
 
 import os
 import sqlite3
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 
 from logger import log
 
@@ -11,47 +12,129 @@ DB_PATH = Path("data/file_index.db")
 
 SUPPORTED_EXT = {".docx", ".xlsx", ".pdf", ".txt", ".png", ".jpg", ".jpeg"}
 
+# ``name_key`` is the name lower-cased by Python: SQLite's ``lower()`` only
+# folds ASCII, so "über" would not find "Über.pdf" through it.
+_INSERT_SQL = (
+    "INSERT OR REPLACE INTO files(path, name, size, mtime, type, name_key) VALUES (?, ?, ?, ?, ?, ?)"
+)
+_BATCH_SIZE = 1024
+
+
+_TLS = threading.local()
+_SCHEMA_READY = set()
+_SCHEMA_LOCK = threading.Lock()
+
 
 def _connect() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+    """Return this thread's cached connection to ``DB_PATH``.
+
+    Connections run in autocommit mode with WAL journaling and the schema is
+    created only once per database file.
+    """
+    conns = getattr(_TLS, "conns", None)
+    if conns is None:
+        conns = _TLS.conns = {}
+    key = str(DB_PATH)
+    conn = conns.get(key)
+    if conn is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # A background reindex may hold the write lock; wait rather than fail.
+        conn.execute("PRAGMA busy_timeout=5000")
+        conns[key] = conn
+    if key not in _SCHEMA_READY:
+        with _SCHEMA_LOCK:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, name TEXT, size INTEGER, mtime REAL, type TEXT, name_key TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_files_type ON files(type)")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+            if "name_key" not in columns:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute("ALTER TABLE files ADD COLUMN name_key TEXT")
+                    rows = conn.execute("SELECT path, name FROM files").fetchall()
+                    conn.executemany(
+                        "UPDATE files SET name_key = ? WHERE path = ?",
+                        [(name.lower(), path) for path, name in rows],
+                    )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            _SCHEMA_READY.add(key)
+    return conn
+
+
+def _escape_like(text: str) -> str:
+    """Escape ``LIKE`` wildcards so keywords match literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _walk(base: str) -> Iterator[os.DirEntry]:
+    """Yield file entries below ``base``, skipping hidden directories.
+
+    ``DirEntry`` objects carry the information from the directory read, so
+    callers can use ``entry.stat()`` without an extra lookup per file.
+    """
+    try:
+        with os.scandir(base) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith("."):
+                    yield from _walk(entry.path)
+            elif entry.is_file():
+                yield entry
+        except OSError:
+            continue
+
 
+def build_file_index(base_dirs: Iterable[str]) -> None:
+    """Walk given directories and store file metadata in an index.
 
-def build_file_index(base_dirs: List[str]) -> None:
-    """Walk given directories and store file metadata in an index."""
+    Hidden directories (names starting with ``.``) are not descended into.
+    """
     try:
         conn = _connect()
         cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, name TEXT, size INTEGER, mtime REAL, type TEXT)"
-        )
-        for base in base_dirs:
-            try:
-                for root, _, files in os.walk(base):
-                    for fname in files:
+        batch: List[tuple] = []
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            for base in base_dirs:
+                try:
+                    for entry in _walk(base):
+                        fname = entry.name
                         ext = os.path.splitext(fname)[1].lower()
                         if ext not in SUPPORTED_EXT:
                             continue
-                        fpath = os.path.join(root, fname)
+                        fpath = entry.path
                         try:
-                            stat = os.stat(fpath)
-                        except Exception:
+                            stat = entry.stat()
+                        except OSError:
                             continue
-                        cur.execute(
-                            "INSERT OR REPLACE INTO files(path, name, size, mtime, type) VALUES (?, ?, ?, ?, ?)",
-                            (fpath, fname, stat.st_size, stat.st_mtime, ext.lstrip(".")),
+                        batch.append(
+                            (fpath, fname, stat.st_size, stat.st_mtime, ext.lstrip("."), fname.lower())
                         )
-            except Exception as exc:
-                log(f"Failed to scan {base}: {exc}", "WARNING")
-        conn.commit()
+                        if len(batch) >= _BATCH_SIZE:
+                            cur.executemany(_INSERT_SQL, batch)
+                            batch.clear()
+                except Exception as exc:
+                    log(f"Failed to scan {base}: {exc}", "WARNING")
+            if batch:
+                cur.executemany(_INSERT_SQL, batch)
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
         log("File index updated")
     except Exception as exc:
         log(f"Build failed: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def search_index(keywords: List[str], type_filter: Optional[str] = None) -> List[str]:
@@ -60,22 +143,17 @@ def search_index(keywords: List[str], type_filter: Optional[str] = None) -> List
     try:
         conn = _connect()
         cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, name TEXT, size INTEGER, mtime REAL, type TEXT)"
-        )
-        cur.execute("SELECT path, name, type FROM files")
-        rows = cur.fetchall()
-        for path, name, ftype in rows:
-            if type_filter and ftype != type_filter.lower():
-                continue
-            lowered = name.lower()
-            if all(kw.lower() in lowered for kw in keywords):
-                matches.append(path)
+        clauses = []
+        params: List[str] = []
+        if type_filter:
+            clauses.append("type = ?")
+            params.append(type_filter.lower())
+        for kw in keywords:
+            clauses.append("name_key LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(kw.lower())}%")
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cur.execute(f"SELECT path FROM files{where}", params)
+        matches = [row[0] for row in cur.fetchall()]
     except Exception as exc:
         log(f"Search failed: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
     return matches
@@ -1,6 +1,7 @@
 """Goal scheduling utilities for Ghosthand."""
 
 import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional
@@ -9,9 +10,31 @@ from memory import DB_PATH
 from logger import log
 
 
+_TLS = threading.local()
+_SCHEMA_READY = set()
+_SCHEMA_LOCK = threading.Lock()
+
+
 def _connect() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+    """Return this thread's cached connection to the memory database."""
+    conns = getattr(_TLS, "conns", None)
+    if conns is None:
+        conns = _TLS.conns = {}
+    key = str(DB_PATH)
+    conn = conns.get(key)
+    if conn is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conns[key] = conn
+    if key not in _SCHEMA_READY:
+        with _SCHEMA_LOCK:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS goal_queue (id INTEGER PRIMARY KEY AUTOINCREMENT, goal TEXT, user TEXT, run_at TEXT, interval INTEGER)"
+            )
+            _SCHEMA_READY.add(key)
+    return conn
 
 
 def add_goal(goal: str, user: str, run_at: datetime, interval: Optional[int] = None) -> None:
@@ -19,22 +42,13 @@ def add_goal(goal: str, user: str, run_at: datetime, interval: Optional[int] = N
     try:
         conn = _connect()
         cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS goal_queue (id INTEGER PRIMARY KEY AUTOINCREMENT, goal TEXT, user TEXT, run_at TEXT, interval INTEGER)"
-        )
         cur.execute(
             "INSERT INTO goal_queue(goal, user, run_at, interval) VALUES (?, ?, ?, ?)",
             (goal, user, run_at.isoformat(timespec='seconds'), interval),
         )
-        conn.commit()
         log(f"Goal queued for {run_at}")
     except Exception as exc:
         log(f"Failed to add goal: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def run_due_goals() -> None:
@@ -43,9 +57,6 @@ def run_due_goals() -> None:
     try:
         conn = _connect()
         cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS goal_queue (id INTEGER PRIMARY KEY AUTOINCREMENT, goal TEXT, user TEXT, run_at TEXT, interval INTEGER)"
-        )
         cur.execute("SELECT id, goal, user, run_at, interval FROM goal_queue WHERE run_at <= ?", (now,))
         rows = cur.fetchall()
         for goal_id, goal_text, user, run_at_str, interval in rows:
@@ -62,14 +73,8 @@ def run_due_goals() -> None:
             else:
                 cur.execute("DELETE FROM goal_queue WHERE id = ?", (goal_id,))
                 log(f"Removed executed goal {goal_id}")
-        conn.commit()
     except Exception as exc:
         log(f"Failed to run due goals: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def set_repeat(goal: str, user: str, interval_minutes: int) -> None:
@@ -2,6 +2,7 @@
 
 
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import scrolledtext, messagebox
 
 from memory import get_recent_goals, list_users
@@ -9,63 +10,87 @@ from main import run_goal
 from user_profile import detect_user
 from enrollment import run_enrollment
 
+# Goals run off the Tk thread so the window stays responsive; results are
+# picked up by polling from the event loop with ``after``.
+POLL_MS = 100
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gui")
 
-def start_gui() -> None:
-    """Launch the Ghosthand graphical interface."""
 
-    root = tk.Tk()
-    root.title("Ghosthand")
-    root.configure(bg="#eef2ff")
+class GhosthandGUI:
+    """Main Ghosthand window; widgets and Tk variables live on the instance."""
+
+    def __init__(self, root: tk.Tk) -> None:
+        self.root = root
+        root.title("Ghosthand")
+        root.configure(bg="#eef2ff")
 
-    title_lbl = tk.Label(root, text="Ghosthand", font=("Helvetica", 16, "bold"), bg="#eef2ff")
-    title_lbl.pack(pady=(10, 5))
+        title_lbl = tk.Label(root, text="Ghosthand", font=("Helvetica", 16, "bold"), bg="#eef2ff")
+        title_lbl.pack(pady=(10, 5))
 
-    entry_frame = tk.Frame(root, bg="#eef2ff")
-    entry_frame.pack(padx=10, pady=10, fill=tk.X)
+        entry_frame = tk.Frame(root, bg="#eef2ff")
+        entry_frame.pack(padx=10, pady=10, fill=tk.X)
 
-    goal_var = tk.StringVar()
-    goal_entry = tk.Entry(entry_frame, textvariable=goal_var, width=60)
-    goal_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.goal_var = tk.StringVar()
+        goal_entry = tk.Entry(entry_frame, textvariable=self.goal_var, width=60)
+        goal_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-    users = list_users()
-    if detect_user() not in users:
-        users.append(detect_user())
-    user_var = tk.StringVar(value=users[0])
-    user_menu = tk.OptionMenu(entry_frame, user_var, *users)
-    user_menu.pack(side=tk.RIGHT)
+        me = detect_user()
+        users = list_users()
+        if me not in users:
+            users.append(me)
+        self.user_var = tk.StringVar(value=users[0])
+        user_menu = tk.OptionMenu(entry_frame, self.user_var, *users)
+        user_menu.pack(side=tk.RIGHT)
 
-    dry_var = tk.BooleanVar()
-    dry_check = tk.Checkbutton(root, text="Dry run", variable=dry_var, bg="#eef2ff")
-    dry_check.pack(anchor="w", padx=10)
+        self.dry_var = tk.BooleanVar()
+        dry_check = tk.Checkbutton(root, text="Dry run", variable=self.dry_var, bg="#eef2ff")
+        dry_check.pack(anchor="w", padx=10)
 
-    enroll_button = tk.Button(root, text="Enroll New User", command=run_enrollment)
-    enroll_button.pack(anchor="w", padx=10, pady=(0, 5))
+        enroll_button = tk.Button(root, text="Enroll New User", command=run_enrollment)
+        enroll_button.pack(anchor="w", padx=10, pady=(0, 5))
 
-    output = scrolledtext.ScrolledText(root, width=80, height=20)
-    output.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+        self.output = scrolledtext.ScrolledText(root, width=80, height=20)
+        self.output.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
 
-    def run_clicked() -> None:
-        goal = goal_var.get().strip()
+        run_button = tk.Button(entry_frame, text="Run Goal", command=self.on_run)
+        run_button.pack(side=tk.RIGHT, padx=(5, 0))
+
+        menubar = tk.Menu(root)
+        history_menu = tk.Menu(menubar, tearoff=0)
+        history_menu.add_command(label="Show Recent Goals", command=self.show_recent)
+        menubar.add_cascade(label="History", menu=history_menu)
+        root.config(menu=menubar)
+
+    def on_run(self) -> None:
+        goal = self.goal_var.get().strip()
         if not goal:
             messagebox.showinfo("Ghosthand", "Please enter a goal.")
             return
-        output.insert(tk.END, f"> {goal}\n")
-        results = run_goal(goal, dry_run=dry_var.get(), user=user_var.get())
-        output.insert(tk.END, f"Result: {results}\n")
-        output.see(tk.END)
-
-    run_button = tk.Button(entry_frame, text="Run Goal", command=run_clicked)
-    run_button.pack(side=tk.RIGHT, padx=(5, 0))
-
-    def show_recent() -> None:
+        self.output.insert(tk.END, f"> {goal}\n")
+        self.output.see(tk.END)
+        future = _executor.submit(run_goal, goal, dry_run=self.dry_var.get(), user=self.user_var.get())
+        self.root.after(POLL_MS, self.poll_result, future)
+
+    def poll_result(self, future: Future) -> None:
+        if not future.done():
+            self.root.after(POLL_MS, self.poll_result, future)
+            return
+        try:
+            results = future.result()
+        except Exception as exc:
+            results = f"Error: {exc}"
+        self.output.insert(tk.END, f"Result: {results}\n")
+        self.output.see(tk.END)
+
+    def show_recent(self) -> None:
         recent = get_recent_goals(5)
         lines = [f"{ts}: {g} -> {r}" for ts, g, r in recent]
         messagebox.showinfo("Recent Goals", "\n".join(lines) if lines else "No history")
 
-    menubar = tk.Menu(root)
-    history_menu = tk.Menu(menubar, tearoff=0)
-    history_menu.add_command(label="Show Recent Goals", command=show_recent)
-    menubar.add_cascade(label="History", menu=history_menu)
-    root.config(menu=menubar)
 
+def start_gui() -> None:
+    """Launch the Ghosthand graphical interface."""
+
+    root = tk.Tk()
+    GhosthandGUI(root)
     root.mainloop()
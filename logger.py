@@ -1,11 +1,14 @@
 """Central logging utilities for Ghosthand."""
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
 LOG_FILE = LOG_DIR / "ghosthand.log"
 
 # Custom log levels
@@ -16,38 +19,207 @@ logging.addLevelName(GUARD_LEVEL, "GUARD")
 logging.addLevelName(WEB_LEVEL, "WEB")
 logging.addLevelName(SKILL_LEVEL, "SKILL")
 
+_LEVELS = {
+    "GUARD": GUARD_LEVEL,
+    "WEB": WEB_LEVEL,
+    "SKILL": SKILL_LEVEL,
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.FATAL,
+}
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """Size-rotating file handler that batches records into larger writes.
+
+    Formatted records are collected in memory and written with a single
+    ``write()`` once ``buffer_size`` bytes are pending, a record of
+    ``flush_level`` or above arrives, ``flush_interval`` seconds have passed
+    since the last write, or the handler is flushed/closed. The queue
+    listener flushes the handler when no record arrives for
+    ``flush_interval`` seconds, so an idle process does not sit on records.
+    """
+
+    def __init__(
+        self,
+        filename,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.WARNING,
+        **kwargs,
+    ) -> None:
+        super().__init__(filename, **kwargs)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._buf: list = []
+        self._pending = 0
+        self._size = None
+        self._last_write = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+                self._size = None
+            if self._size is None:
+                self.stream.seek(0, 2)
+                self._size = self.stream.tell()
+            nbytes = len(msg.encode(self.stream.encoding, self.errors or "strict"))
+            if self.maxBytes > 0 and self._size + self._pending + nbytes >= self.maxBytes:
+                self._write_buffer()
+                self.doRollover()
+                self._size = 0
+            self._buf.append(msg)
+            self._pending += nbytes
+            if (
+                self._pending >= self.buffer_size
+                or record.levelno >= self.flush_level
+                or time.monotonic() - self._last_write >= self.flush_interval
+            ):
+                self._write_buffer()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _write_buffer(self) -> None:
+        if self._buf and self.stream is not None:
+            self.stream.write("".join(self._buf))
+            self.stream.flush()
+            self._size = (self._size or 0) + self._pending
+        self._buf.clear()
+        self._pending = 0
+        self._last_write = time.monotonic()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            self._write_buffer()
+        finally:
+            self.release()
+        super().flush()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self._write_buffer()
+        finally:
+            self.release()
+        super().close()
+
+
+class _FlushingQueueListener(QueueListener):
+    """Queue listener that answers :func:`flush_logs` sentinels in order.
+
+    While the queue stays empty for ``flush_interval`` seconds the handlers
+    are flushed from the listener thread, so buffered records reach the file
+    without a separate timer.
+    """
+
+    def __init__(self, queue, *handlers, flush_interval: float = 1.0, **kwargs) -> None:
+        super().__init__(queue, *handlers, **kwargs)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            try:
+                return self.queue.get(block, self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+    def handle(self, record: logging.LogRecord) -> None:
+        done = getattr(record, "flush_event", None)
+        if done is None:
+            super().handle(record)
+            return
+        for handler in self.handlers:
+            handler.flush()
+        done.set()
+
+
+_FORMATTER = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+
 _logger = None
+_listener = None
+_file_handler = None
+_listener_running = False
+_INIT_LOCK = threading.Lock()
+
+
+def _stop_listener() -> None:
+    global _listener_running
+    if _listener is not None and _listener_running:
+        _listener.stop()
+        _listener_running = False
 
 
 def _init_logger() -> logging.Logger:
+    global _listener, _file_handler, _listener_running
     logger = logging.getLogger("ghosthand")
     logger.setLevel(logging.INFO)
-    if not logger.handlers:
-        size_handler = RotatingFileHandler(
+    with _INIT_LOCK:
+        if logger.handlers:
+            return logger
+        try:
+            LOG_DIR.mkdir(exist_ok=True)
+        except OSError:
+            pass
+        handler = BufferedRotatingFileHandler(
             LOG_FILE, maxBytes=1_000_000, backupCount=5
         )
-        time_handler = TimedRotatingFileHandler(
-            LOG_FILE, when="D", interval=1, backupCount=7
+        handler.setFormatter(_FORMATTER)
+        _file_handler = handler
+        # Callers only enqueue records; a background listener thread does the
+        # file writes and rollover checks.
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _listener = _FlushingQueueListener(
+            records, handler, respect_handler_level=True,
+            flush_interval=handler.flush_interval,
         )
-        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-        for h in (size_handler, time_handler):
-            h.setFormatter(formatter)
-            logger.addHandler(h)
+        _listener.start()
+        _listener_running = True
+        atexit.register(_stop_listener)
+        logger.addHandler(QueueHandler(records))
     return logger
 
 
-def log(message: str, level: str = "INFO") -> None:
-    """Log a message to the shared logfile."""
+def log(message: str, level: str = "INFO", *args: object) -> None:
+    """Log a message to the shared logfile.
+
+    ``args`` are merged into ``message`` with ``%`` formatting only if the
+    record is actually emitted, so hot paths can avoid building strings for
+    filtered levels.
+    """
     global _logger
     if _logger is None:
         _logger = _init_logger()
-    upper = level.upper()
-    if upper == "GUARD":
-        lvl = GUARD_LEVEL
-    elif upper == "WEB":
-        lvl = WEB_LEVEL
-    elif upper == "SKILL":
-        lvl = SKILL_LEVEL
-    else:
-        lvl = getattr(logging, upper, logging.INFO)
-    _logger.log(lvl, message)
+    lvl = _LEVELS.get(level)
+    if lvl is None:
+        lvl = _LEVELS.get(level.upper(), logging.INFO)
+    if not _logger.isEnabledFor(lvl):
+        return
+    _logger.log(lvl, message, *args)
+
+
+def flush_logs(timeout: float = 5.0) -> None:
+    """Write every record logged so far to the logfile before returning.
+
+    A sentinel is queued behind the pending records; the listener flushes
+    the file handler when it reaches it, so nothing still queued is missed.
+    """
+    if _listener is None:
+        return
+    if not _listener_running:  # stopped at exit; nothing left to drain
+        if _file_handler is not None:
+            _file_handler.flush()
+        return
+    done = threading.Event()
+    _listener.queue.put_nowait(logging.makeLogRecord({"flush_event": done}))
+    if not done.wait(timeout) and _file_handler is not None:
+        _file_handler.flush()
@@ -15,29 +15,32 @@ from typing import Dict
 from logger import log
 from memory import log_rejection
 
+OWNER = "william"
+
+_HARMFUL = re.compile(r"rm -rf|format|shutdown|delete system32|self-destruct", re.IGNORECASE)
+_DANGEROUS = re.compile(r"delete|remove|format|shutdown", re.IGNORECASE)
+_DANGEROUS_AGENTS = frozenset({"os", "subprocess"})
+
+
+def _is_owner(user: str) -> bool:
+    """Case-insensitive owner check; names of the wrong length aren't copied."""
+    return len(user) == len(OWNER) and user.lower() == OWNER
+
 
 class LoyaltyCore:
     """Implements basic loyalty rules for Ghosthand."""
 
-    OWNER = "william"
+    OWNER = OWNER
 
     def can_execute(self, goal: str, user: str) -> bool:
         """Return ``True`` if the goal may be executed."""
 
-        if user.lower() != self.OWNER:
+        if not _is_owner(user):
             log("Goal rejected: unauthorised user", "GUARD")
             log_rejection(goal, "unauthorised user", user)
             return False
 
-        harmful = [
-            "rm -rf",
-            "format",
-            "shutdown",
-            "delete system32",
-            "self-destruct",
-        ]
-        gl = goal.lower()
-        if any(h in gl for h in harmful):
+        if _HARMFUL.search(goal):
             log("Goal rejected: potential harm detected", "GUARD")
             log_rejection(goal, "potentially harmful", user)
             return False
@@ -47,17 +50,18 @@ class LoyaltyCore:
     def enforce_rules(self, step: Dict[str, object], user: str) -> Dict[str, object] | None:
         """Validate a planned step before execution."""
 
-        if user.lower() != self.OWNER:
+        if not _is_owner(user):
             log("Step skipped for unauthorised user", "GUARD")
             return None
 
-        agent = str(step.get("agent", "")).lower()
-        action = str(step.get("action", "")).lower()
+        agent = str(step.get("agent", ""))
+        action = str(step.get("action", ""))
 
-        dangerous = re.compile(r"(delete|remove|format|shutdown)")
-        if agent in {"os", "subprocess"} or dangerous.search(action):
+        # The action is matched case-insensitively by the regex; only the
+        # short agent name is lower-cased.
+        if agent.lower() in _DANGEROUS_AGENTS or _DANGEROUS.search(action):
             log("Step rejected: appears dangerous", "GUARD")
-            log_rejection(f"{agent}.{action}", "dangerous step", user)
+            log_rejection(f"{agent}.{action}".lower(), "dangerous step", user)
             return None
 
         return step
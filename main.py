@@ -6,16 +6,21 @@ dispatches those steps to the appropriate agent modules.
 """
 
 import importlib
+import importlib.util
 import argparse
 import os
+import re
+import threading
+import time
 from datetime import datetime
-from typing import Any, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from planner import generate_plan, parse_plan_string
 from memory import log_goal, log_voice_verification
 from loyalty import loyalty
 from security import identity_verified
-from logger import log
+from logger import LOG_DIR, flush_logs, log
 from user_profile import detect_user
 import goal_queue
 from file_indexer import build_file_index
@@ -29,34 +34,103 @@ except Exception:
     voice_output = None
 
 
+# Scratch file for startup voice checks; removed after each verification.
+VOICE_SAMPLE = LOG_DIR / ".voice.wav"
+
+_INDEX_PATHS = tuple(
+    os.path.join(os.path.expanduser("~"), p) for p in ("Downloads", "Documents", "Desktop")
+)
+INDEX_TTL = 60.0
+# Goals mentioning none of these never reach the file index, so the
+# filesystem walk is skipped for them.
+_FS_KEYWORDS = frozenset(
+    {"file", "screenshot", "document", "download", "pdf", "image", "folder"}
+)
+_LAST_INDEX_TS: Optional[float] = None
+_INDEX_LOCK = threading.Lock()
+
+SUMMARY_MAX_CHARS = 512
+
+_REF_RE = re.compile(r"<result_from_step_\s*(-?\d+)\s*>")
+
+# Resolved agent callables keyed by (agent, action); agent modules are never
+# reloaded within a process so entries stay valid.
+_AGENT_CACHE: Dict[Tuple[str, str], Callable[..., Any]] = {}
+# Importable module name for each agent, e.g. "file_agent" -> "agents.file_agent".
+_MODULE_NAMES: Dict[str, str] = {}
+
+
+def _module_name(agent_name: str) -> str:
+    """Return the module implementing ``agent_name``.
+
+    Top-level modules take precedence; anything else is looked up in the
+    ``agents`` package.
+    """
+    name = _MODULE_NAMES.get(agent_name)
+    if name is None:
+        name = agent_name if importlib.util.find_spec(agent_name) else f"agents.{agent_name}"
+        _MODULE_NAMES[agent_name] = name
+    return name
+
+
+# Agents most plans touch; imported at startup so the first step of a goal
+# doesn't pay for their (sometimes heavy) module imports.
+_PRELOAD_AGENTS = ("file_agent", "comms_agent", "browser_agent", "web_search")
+
+
+def _preload_agents() -> None:
+    """Import the common agent modules and record their resolved names."""
+    for agent_name in _PRELOAD_AGENTS:
+        try:
+            importlib.import_module(_module_name(agent_name))
+        except Exception as exc:
+            log("Could not preload agent %s: %s", "WARNING", agent_name, exc)
+
+
+def _resolve_action(agent_name: str, action_name: str) -> Callable[..., Any]:
+    """Return the callable implementing ``agent_name.action_name``."""
+    key = (agent_name, action_name)
+    func = _AGENT_CACHE.get(key)
+    if func is None:
+        module = importlib.import_module(_module_name(agent_name))
+        func = getattr(module, action_name)
+        _AGENT_CACHE[key] = func
+    return func
+
+
 def _execute_steps(plan: List[dict], dry_run: bool, speak: bool, user: str) -> List[Any]:
     results: List[Any] = []
 
     for idx, step in enumerate(plan):
         step = loyalty.enforce_rules(step, user)
         if not step:
-            log(f"Step {idx} blocked by loyalty core", "GUARD")
+            log("Step %d blocked by loyalty core", "GUARD", idx)
             results.append(None)
             continue
 
         agent_name = step.get("agent")
         action_name = step.get("action")
-        params = step.get("params", {}).copy()
+        # One merged dict per step: it carries the default ``user`` and is the
+        # only object placeholder resolution writes to, so the plan is never
+        # mutated.
+        params = {"user": user, **step.get("params", {})}
 
         if speak and voice_output:
             voice_output.speak(f"Step {idx}: {agent_name}.{action_name}")
 
-        for key, val in list(params.items()):
-            if isinstance(val, str) and val.startswith("<result_from_step_") and val.endswith(">"):
-                try:
-                    ref_index = int(val[len("<result_from_step_") : -1])
-                    params[key] = results[ref_index]
-                except Exception as exc:
-                    log(f"Failed to resolve parameter {val}: {exc}", "WARNING")
-
-        params.setdefault("user", user)
-
-        log(f"Executing step {idx}: {agent_name}.{action_name}({params})")
+        for key, val in params.items():
+            if not isinstance(val, str) or "<result_from_step_" not in val:
+                continue
+            match = _REF_RE.fullmatch(val.strip())
+            if match is None:
+                log("Unrecognised step reference in parameter %s: %r", "WARNING", key, val)
+                continue
+            try:
+                params[key] = results[int(match.group(1))]
+            except Exception as exc:
+                log("Failed to resolve parameter %s: %s", "WARNING", val, exc)
+
+        log("Executing step %d: %s.%s(%r)", "INFO", idx, agent_name, action_name, params)
         if dry_run:
             log("Dry-run active: skipping execution")
             results.append(None)
@@ -64,31 +138,64 @@ def _execute_steps(plan: List[dict], dry_run: bool, speak: bool, user: str) -> L
         try:
             if agent_name.startswith("skill:"):
                 skill_name = agent_name.split(":", 1)[1]
-                log(f"Running skill {skill_name}", "SKILL")
+                log("Running skill %s", "SKILL", skill_name)
                 skill = get_skill(skill_name)
                 if not skill:
                     raise RuntimeError(f"Skill {skill_name} not loaded")
                 result = skill.execute(**params)
             else:
-                try:
-                    module = importlib.import_module(agent_name)
-                except ModuleNotFoundError:
-                    module = importlib.import_module(f"agents.{agent_name}")
-                func = getattr(module, action_name)
+                func = _resolve_action(agent_name, action_name)
                 result = func(**params)
 
             results.append(result)
-            log(f"Step {idx} returned: {result}")
+            log("Step %d returned: %s", "INFO", idx, result)
             if speak and voice_output:
                 voice_output.speak(f"Step {idx} completed")
         except Exception as exc:
-            log(f"Step {idx} failed: {exc}", "ERROR")
+            log("Step %d failed: %s", "ERROR", idx, exc)
             break
 
+    # Step records are batched by the file handler; make this goal's trail
+    # visible in the logfile before returning.
+    flush_logs()
     return results
 
 
-def run_goal(goal: str, dry_run: bool = False, speak: bool = False, user: str = "default") -> List[Any]:
+def _summarize(results: List[Any]) -> str:
+    """Return a short description of the last step result for ``log_goal``."""
+    last = results[-1] if results else None
+    if last is None:
+        return "no result"
+    if isinstance(last, (bytes, bytearray)):
+        return f"<{len(last)} bytes>"
+    return str(last)[:SUMMARY_MAX_CHARS]
+
+
+def _maybe_reindex(force: bool = False) -> None:
+    """Refresh the file index at most once per ``INDEX_TTL`` seconds.
+
+    The walk runs on a background thread so goals are not blocked by it;
+    ``force`` rebuilds synchronously regardless of the last scan time.
+    """
+    global _LAST_INDEX_TS
+    with _INDEX_LOCK:
+        now = time.monotonic()
+        if not force and _LAST_INDEX_TS is not None and now - _LAST_INDEX_TS < INDEX_TTL:
+            return
+        _LAST_INDEX_TS = now
+    if force:
+        build_file_index(_INDEX_PATHS)
+        return
+    threading.Thread(target=build_file_index, args=(_INDEX_PATHS,), daemon=True, name="file-index").start()
+
+
+def run_goal(
+    goal: str,
+    dry_run: bool = False,
+    speak: bool = False,
+    user: str = "default",
+    rebuild_index: bool = False,
+) -> List[Any]:
     log(f"Goal received for {user}: {goal}")
     if not identity_verified(user):
         log("Identity verification failed", "GUARD")
@@ -98,14 +205,14 @@ def run_goal(goal: str, dry_run: bool = False, speak: bool = False, user: str =
     if speak and voice_output:
         voice_output.speak(f"Running goal for {user}")
 
-    home = os.path.expanduser("~")
-    build_file_index([os.path.join(home, p) for p in ["Downloads", "Documents", "Desktop"]])
+    if rebuild_index or any(k in goal.lower() for k in _FS_KEYWORDS):
+        _maybe_reindex(force=rebuild_index)
     plan = generate_plan(goal, user)
     log(f"Generated plan: {plan}")
 
     results = _execute_steps(plan, dry_run, speak, user)
 
-    summary = str(results[-1]) if results else "no result"
+    summary = _summarize(results)
     try:
         log_goal(goal, summary, user)
     except Exception as exc:
@@ -129,7 +236,7 @@ def run_plan_direct(plan_text: str, user: str = "default", dry_run: bool = False
 
     results = _execute_steps(plan, dry_run, False, user)
 
-    summary = str(results[-1]) if results else "no result"
+    summary = _summarize(results)
     try:
         log_goal(f"direct:{plan_text}", summary, user)
     except Exception as exc:
@@ -143,6 +250,17 @@ def run_test_goal(dry_run: bool = False, speak: bool = False, user: str = "defau
     log(f"Test goal completed with results: {results}")
 
 
+def _record_sample() -> Path:
+    """Record a 5 second voice sample to ``VOICE_SAMPLE`` and return its path.
+
+    Callers call this inside a ``try`` whose ``finally`` deletes
+    ``VOICE_SAMPLE``, so a failed recording never leaves a clip behind.
+    """
+    VOICE_SAMPLE.parent.mkdir(parents=True, exist_ok=True)
+    record_voice_sample(str(VOICE_SAMPLE), 5)
+    return VOICE_SAMPLE
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Ghosthand AI Agent")
     parser.add_argument("--goal", help="Goal for the agent")
@@ -173,22 +291,24 @@ def main() -> None:
         return
 
     if args.re_enroll:
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
-            record_voice_sample(tmp.name, 5)
-            user_match = verify_user(tmp.name)
+        try:
+            sample = _record_sample()
+            user_match = verify_user(str(sample))
             log_voice_verification(user_match, user_match == 'william')
             if user_match == 'william':
-                enroll_user('william', tmp.name)
+                enroll_user('william', str(sample))
                 log('Re-enrollment completed', 'GUARD')
             else:
                 log('Re-enrollment failed: voice mismatch', 'ERROR')
+        finally:
+            VOICE_SAMPLE.unlink(missing_ok=True)
         return
 
-    import tempfile
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
-        record_voice_sample(tmp.name, 5)
-        user_match = verify_user(tmp.name)
+    try:
+        sample = _record_sample()
+        user_match = verify_user(str(sample))
+    finally:
+        VOICE_SAMPLE.unlink(missing_ok=True)
     log_voice_verification(user_match, user_match == 'william')
     if user_match != 'william':
         log('Voice verification failed', 'GUARD')
@@ -209,6 +329,8 @@ def main() -> None:
         goal_queue.set_repeat(args.repeat, user, interval)
         return
 
+    _preload_agents()
+
     if args.voice:
         try:
             from voice_input import listen_and_transcribe
@@ -4,21 +4,45 @@ Stores instructions or other persistent context so that future runs can
 access prior interactions.
 """
 
+import functools
+import re
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 
 from logger import log
 
 DB_PATH = Path("data/memory.db")
 
+# WAL with synchronous=NORMAL turns each commit into a log append instead of
+# an fsync of the main database file.
+_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA busy_timeout=5000;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-20000;
+"""
+
+
+def _now_iso() -> str:
+    """Local time as ``YYYY-MM-DDTHH:MM:SS``, the format stored in every table."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    conn.executescript(_PRAGMAS)
+
+
 class Memory:
     """Simple wrapper around SQLite for storing instructions."""
 
     def __init__(self, db_path: str = str(DB_PATH)):
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(db_path)
+        _apply_pragmas(self.conn)
         self._ensure_tables()
 
     def _ensure_tables(self) -> None:
@@ -40,40 +64,98 @@ class Memory:
         return row[0] if row else None
 
 
+_TLS = threading.local()
+# SQLite allows one writer at a time; serialising writes here avoids
+# threads spinning on SQLITE_BUSY.
+_WRITE_LOCK = threading.Lock()
+
+
 def _connect() -> sqlite3.Connection:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    _apply_pragmas(conn)
+    return conn
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instructions (id INTEGER PRIMARY KEY, text TEXT);
+CREATE TABLE IF NOT EXISTS preferences (user TEXT, category TEXT, key TEXT, value TEXT, PRIMARY KEY(user, category, key));
+CREATE TABLE IF NOT EXISTS goal_log (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, user TEXT, goal TEXT, result TEXT);
+CREATE INDEX IF NOT EXISTS idx_goal_log_user_id ON goal_log(user, id DESC);
+CREATE TABLE IF NOT EXISTS rejections (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, user TEXT, goal TEXT, reason TEXT);
+CREATE TABLE IF NOT EXISTS events (timestamp TEXT, event TEXT, user TEXT, details TEXT);
+"""
+_SCHEMA_READY = set()
+
+# Full-text index over goal_log.goal, kept in sync by triggers. It backs the
+# keyword fallback in query_memory when scikit-learn is unavailable; SQLite
+# builds without FTS5 fall back to difflib instead.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE goal_log_fts USING fts5(goal, content='goal_log', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS goal_log_fts_ai AFTER INSERT ON goal_log BEGIN
+    INSERT INTO goal_log_fts(rowid, goal) VALUES (new.id, new.goal);
+END;
+CREATE TRIGGER IF NOT EXISTS goal_log_fts_ad AFTER DELETE ON goal_log BEGIN
+    INSERT INTO goal_log_fts(goal_log_fts, rowid, goal) VALUES ('delete', old.id, old.goal);
+END;
+INSERT INTO goal_log_fts(goal_log_fts) VALUES ('rebuild');
+"""
+_FTS_READY = set()
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    with _WRITE_LOCK:
+        conn.executescript(_SCHEMA)
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'goal_log_fts'"
+        ).fetchone()
+        if not exists:
+            try:
+                # Created once and filled from any goals logged before it existed.
+                conn.executescript(_FTS_SCHEMA)
+            except sqlite3.OperationalError as exc:
+                log(f"Full-text goal search unavailable: {exc}", "WARNING")
+                return
+    _FTS_READY.add(str(DB_PATH))
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return this thread's cached connection to ``DB_PATH``.
+
+    The schema is created the first time each database file is opened, so
+    the helpers below only run their own statements.
+    """
+    conns = getattr(_TLS, "conns", None)
+    if conns is None:
+        conns = _TLS.conns = {}
+    key = str(DB_PATH)
+    conn = conns.get(key)
+    if conn is None:
+        conn = conns[key] = _connect()
+    if key not in _SCHEMA_READY:
+        _init_schema(conn)
+        _SCHEMA_READY.add(key)
+    return conn
 
 
 def learn_preference(user: str, category: str, key: str, value: str) -> None:
     try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS preferences (user TEXT, category TEXT, key TEXT, value TEXT, PRIMARY KEY(user, category, key))"
-        )
-        cur.execute(
-            "INSERT OR REPLACE INTO preferences(user, category, key, value) VALUES (?, ?, ?, ?)",
-            (user, category, key, value),
-        )
-        conn.commit()
+        conn = _get_conn()
+        with _WRITE_LOCK, conn:
+            cur = conn.cursor()
+            cur.execute(
+                "INSERT OR REPLACE INTO preferences(user, category, key, value) VALUES (?, ?, ?, ?)",
+                (user, category, key, value),
+            )
         log(f"Stored preference {user}/{category}/{key}")
     except Exception as exc:
         log(f"Failed to store preference: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def get_preference(user: str, category: str, key: str) -> Optional[str]:
     try:
-        conn = _connect()
+        conn = _get_conn()
         cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS preferences (user TEXT, category TEXT, key TEXT, value TEXT, PRIMARY KEY(user, category, key))"
-        )
         cur.execute(
             "SELECT value FROM preferences WHERE user = ? AND category = ? AND key = ?",
             (user, category, key),
@@ -83,66 +165,42 @@ def get_preference(user: str, category: str, key: str) -> Optional[str]:
     except Exception as exc:
         log(f"Failed to get preference: {exc}", "ERROR")
         return None
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def log_goal(goal: str, result_summary: str, user: str) -> None:
     try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS goal_log (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, user TEXT, goal TEXT, result TEXT)"
-        )
-        ts = datetime.now().isoformat(timespec="seconds")
-        cur.execute(
-            "INSERT INTO goal_log(timestamp, user, goal, result) VALUES (?, ?, ?, ?)",
-            (ts, user, goal, result_summary),
-        )
-        conn.commit()
+        conn = _get_conn()
+        with _WRITE_LOCK, conn:
+            cur = conn.cursor()
+            ts = _now_iso()
+            cur.execute(
+                "INSERT INTO goal_log(timestamp, user, goal, result) VALUES (?, ?, ?, ?)",
+                (ts, user, goal, result_summary),
+            )
         log(f"Logged goal at {ts}", "INFO")
     except Exception as exc:
         log(f"Failed to log goal: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def log_rejection(goal: str, reason: str, user: str) -> None:
     try:
-        conn = _connect()
-        cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS rejections (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, user TEXT, goal TEXT, reason TEXT)"
-        )
-        ts = datetime.now().isoformat(timespec="seconds")
-        cur.execute(
-            "INSERT INTO rejections(timestamp, user, goal, reason) VALUES (?, ?, ?, ?)",
-            (ts, user, goal, reason),
-        )
-        conn.commit()
+        conn = _get_conn()
+        with _WRITE_LOCK, conn:
+            cur = conn.cursor()
+            ts = _now_iso()
+            cur.execute(
+                "INSERT INTO rejections(timestamp, user, goal, reason) VALUES (?, ?, ?, ?)",
+                (ts, user, goal, reason),
+            )
         log(f"Logged rejection for {user}: {reason}", "INFO")
     except Exception as exc:
         log(f"Failed to log rejection: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def get_recent_goals(limit: int = 5, user: Optional[str] = None) -> List[Tuple[str, str, str]]:
     try:
-        conn = _connect()
+        conn = _get_conn()
         cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS goal_log (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, user TEXT, goal TEXT, result TEXT)"
-        )
         if user:
             cur.execute(
                 "SELECT timestamp, goal, result FROM goal_log WHERE user = ? ORDER BY id DESC LIMIT ?",
@@ -157,62 +215,246 @@ def get_recent_goals(limit: int = 5, user: Optional[str] = None) -> List[Tuple[s
     except Exception as exc:
         log(f"Failed to fetch recent goals: {exc}", "ERROR")
         return []
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def list_users() -> List[str]:
     try:
-        conn = _connect()
+        conn = _get_conn()
         cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS goal_log (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, user TEXT, goal TEXT, result TEXT)"
-        )
         cur.execute("SELECT DISTINCT user FROM goal_log")
         return [r[0] for r in cur.fetchall() if r[0]]
     except Exception as exc:
         log(f"Failed to list users: {exc}", "ERROR")
         return []
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
-def query_memory(goal: str, user: Optional[str] = None) -> List[Tuple[str, str, str]]:
-    try:
-        conn = _connect()
-        cur = conn.cursor()
+# Only the most recent goals are considered when looking for similar ones,
+# which bounds memory and scoring cost however long the log grows.
+MEMORY_SCAN_LIMIT = 5000
+
+# Hashed term counts and document frequencies per (database, user). Each goal
+# is tokenised once when it first appears; idf weights are updated from the
+# document frequencies when new goals arrive, so nothing is ever refitted.
+_HASH_FEATURES = 2 ** 18
+_GOAL_INDEX: Dict[Tuple[str, Optional[str]], dict] = {}
+_GOAL_INDEX_LOCK = threading.Lock()
+_FTS_WORD_RE = re.compile(r"\w+")
+
+
+def _goal_rows(cur: sqlite3.Cursor, user: Optional[str], after_id: int = 0) -> List[tuple]:
+    """Return up to ``MEMORY_SCAN_LIMIT`` of the newest goal rows after ``after_id``, oldest first."""
+    if user:
         cur.execute(
-            "CREATE TABLE IF NOT EXISTS goal_log (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, user TEXT, goal TEXT, result TEXT)"
+            "SELECT id, timestamp, goal, result FROM goal_log WHERE user = ? AND id > ? ORDER BY id DESC LIMIT ?",
+            (user, after_id, MEMORY_SCAN_LIMIT),
         )
-        if user:
-            cur.execute("SELECT timestamp, goal, result FROM goal_log WHERE user = ?", (user,))
+    else:
+        cur.execute(
+            "SELECT id, timestamp, goal, result FROM goal_log WHERE id > ? ORDER BY id DESC LIMIT ?",
+            (after_id, MEMORY_SCAN_LIMIT),
+        )
+    rows = cur.fetchall()
+    rows.reverse()
+    return rows
+
+
+@functools.lru_cache(maxsize=1)
+def _hasher():
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(n_features=_HASH_FEATURES, alternate_sign=False, norm=None)
+
+
+def _merge_doc_freq(cols, df, other_cols, other_df):
+    """Add ``other_df`` to the sparse document frequencies ``(cols, df)``.
+
+    Both inputs are sorted column arrays with aligned counts; columns whose
+    count drops to zero are removed from the result.
+    """
+    import numpy as np
+
+    merged, inverse = np.unique(np.concatenate([cols, other_cols]), return_inverse=True)
+    total = np.bincount(inverse, weights=np.concatenate([df, other_df])).astype(np.int64)
+    keep = total > 0
+    return merged[keep], total[keep]
+
+
+def _goal_index(cur: sqlite3.Cursor, user: Optional[str]) -> dict:
+    """Return the hashed TF-IDF index over the newest goal log rows.
+
+    Document frequencies are kept only for the hashed columns that occur in
+    the window (``cols``/``idf``), and ``weights`` holds the TF-IDF weight of
+    every stored count, aligned with ``counts.data``. Both are recomputed
+    only when new goals arrive.
+    """
+    import numpy as np
+    from scipy.sparse import vstack
+
+    key = (str(DB_PATH), user)
+    with _GOAL_INDEX_LOCK:
+        entry = _GOAL_INDEX.get(key)
+        new = _goal_rows(cur, user, entry["last_id"] if entry else 0)
+        if not new and entry is not None:
+            return entry
+
+        added = _hasher().transform([r[2] for r in new])
+        # CSR rows hold each column at most once, so counting column indices
+        # gives the number of goals containing each term.
+        add_cols, add_df = np.unique(added.indices, return_counts=True)
+        if entry is None:
+            counts, cols, df = added, add_cols, add_df
+            rows = [r[1:] for r in new]
         else:
-            cur.execute("SELECT timestamp, goal, result FROM goal_log")
-        rows = cur.fetchall()
-        goals = [row[1] for row in rows]
+            counts = vstack([entry["counts"], added], format="csr")
+            cols, df = _merge_doc_freq(entry["cols"], entry["df"], add_cols, add_df)
+            rows = entry["rows"] + [r[1:] for r in new]
+        drop = len(rows) - MEMORY_SCAN_LIMIT
+        if drop > 0:
+            old_cols, old_df = np.unique(counts[:drop].indices, return_counts=True)
+            cols, df = _merge_doc_freq(cols, df, old_cols, -old_df)
+            counts = counts[drop:]
+            rows = rows[drop:]
+        # Smoothed idf, matching TfidfVectorizer's defaults.
+        idf = np.log((1 + len(rows)) / (1 + df)) + 1.0
+        entry = {
+            "counts": counts,
+            "cols": cols,
+            "df": df,
+            "idf": idf,
+            "weights": counts.data * idf[np.searchsorted(cols, counts.indices)],
+            "rows": rows,
+            "last_id": new[-1][0] if new else 0,
+        }
+        _GOAL_INDEX[key] = entry
+        return entry
+
+
+def _query_weights(index: dict, goal: str):
+    """Return the sorted hashed columns of ``goal`` and their TF-IDF weights.
+
+    Only the query's own columns are looked up; terms that no stored goal
+    contains get the idf of a zero document frequency.
+    """
+    import numpy as np
+
+    query = _hasher().transform([goal])
+    query.sort_indices()
+    cols, idf = index["cols"], index["idf"]
+    q_idf = np.full(query.indices.size, np.log(1 + len(index["rows"])) + 1.0)
+    if cols.size:
+        pos = np.minimum(np.searchsorted(cols, query.indices), cols.size - 1)
+        known = cols[pos] == query.indices
+        q_idf[known] = idf[pos[known]]
+    return query.indices, query.data * q_idf
+
+
+# Below this many rows the sparse path finishes in well under a millisecond,
+# less than importing numba would cost a short-lived process.
+_NUMBA_MIN_ROWS = 2000
+
+
+@functools.lru_cache(maxsize=1)
+def _cosine_kernel():
+    """Return a numba-compiled CSR cosine kernel, or ``None`` without numba.
+
+    The kernel computes row norms and the dot product with the query in one
+    pass over the stored weights, without materialising a normalised copy
+    of the matrix. It runs serially: the goal window is small enough that
+    thread start-up would cost more than it saves.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    import numpy as np
+
+    @njit(cache=True, fastmath=True)
+    def kernel(indptr, indices, weights, q_idx, q_w, q_norm):
+        n = indptr.size - 1
+        out = np.zeros(n)
+        for r in range(n):
+            dot = 0.0
+            norm = 0.0
+            for k in range(indptr[r], indptr[r + 1]):
+                w = weights[k]
+                norm += w * w
+                j = indices[k]
+                pos = np.searchsorted(q_idx, j)
+                if pos < q_idx.size and q_idx[pos] == j:
+                    dot += w * q_w[pos]
+            if norm > 0.0:
+                out[r] = dot / (np.sqrt(norm) * q_norm)
+        return out
+
+    return kernel
+
+
+def _goal_similarities(index: dict, goal: str):
+    """Cosine similarity of ``goal`` to every goal in ``index``."""
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from sklearn.preprocessing import normalize
+
+    counts = index["counts"]
+    q_idx, q_w = _query_weights(index, goal)
+    q_norm = float(np.sqrt(q_w @ q_w))
+    if q_norm == 0.0:
+        return np.zeros(counts.shape[0])
+    kernel = _cosine_kernel() if counts.shape[0] >= _NUMBA_MIN_ROWS else None
+    if kernel is None:
+        weighted = csr_matrix((index["weights"], counts.indices, counts.indptr), shape=counts.shape)
+        query = csr_matrix((q_w / q_norm, q_idx, [0, q_idx.size]), shape=(1, counts.shape[1]))
+        return (normalize(weighted) @ query.T).toarray().ravel()
+    return kernel(counts.indptr, counts.indices, index["weights"], q_idx, q_w, q_norm)
+
+
+def _fts_matches(cur: sqlite3.Cursor, goal: str, user: Optional[str]) -> List[Tuple[str, str, str]]:
+    """Return up to three goals sharing words with ``goal``, best BM25 rank first."""
+    words = _FTS_WORD_RE.findall(goal.lower())
+    if not words:
+        return []
+    query = " OR ".join(f'"{w}"' for w in words)
+    sql = (
+        "SELECT g.timestamp, g.goal, g.result FROM goal_log_fts"
+        " JOIN goal_log AS g ON g.id = goal_log_fts.rowid"
+        " WHERE goal_log_fts MATCH ?"
+    )
+    params: tuple = (query,)
+    if user:
+        sql += " AND g.user = ?"
+        params += (user,)
+    cur.execute(sql + " ORDER BY rank LIMIT 3", params)
+    return cur.fetchall()
+
+
+def query_memory(goal: str, user: Optional[str] = None) -> List[Tuple[str, str, str]]:
+    try:
+        conn = _get_conn()
+        cur = conn.cursor()
 
         results: List[Tuple[str, str, str]] = []
         try:
-            from sklearn.feature_extraction.text import TfidfVectorizer
-            from sklearn.metrics.pairwise import cosine_similarity
-
-            vect = TfidfVectorizer().fit(goals + [goal])
-            mat = vect.transform(goals + [goal])
-            sims = cosine_similarity(mat[-1], mat[:-1]).flatten()
-            top_idx = sims.argsort()[::-1][:3]
-            for idx in top_idx:
-                if sims[idx] <= 0:
-                    continue
-                ts, gtxt, res = rows[idx]
-                results.append((ts, gtxt, res))
+            import numpy as np
+
+            index = _goal_index(cur, user)
+            rows = index["rows"]
+            if not rows:
+                return []
+            sims = _goal_similarities(index, goal)
+            hits = np.flatnonzero(sims > 0)
+            if hits.size > 3:
+                # Keep every row tied with the third best score so the newest
+                # of equally similar goals can win below.
+                third = sims[hits][np.argpartition(sims[hits], -3)[-3]]
+                hits = hits[sims[hits] >= third]
+            for idx in hits[np.lexsort((hits, sims[hits]))[::-1][:3]]:
+                results.append(rows[idx])
         except Exception:
+            if str(DB_PATH) in _FTS_READY:
+                return _fts_matches(cur, goal, user)
             import difflib
+            rows = [r[1:] for r in _goal_rows(cur, user)]
+            goals = [row[1] for row in rows]
             matches = difflib.get_close_matches(goal, goals, n=3, cutoff=0.4)
             for m in matches:
                 for ts, gtxt, res in rows:
@@ -223,77 +465,48 @@ def query_memory(goal: str, user: Optional[str] = None) -> List[Tuple[str, str,
     except Exception as exc:
         log(f"Failed to query memory: {exc}", "ERROR")
         return []
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
-
-
-def _ensure_event_table(cur):
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS events (timestamp TEXT, event TEXT, user TEXT, details TEXT)"
-    )
 
 
 def log_first_run() -> None:
     try:
-        conn = _connect()
-        cur = conn.cursor()
-        _ensure_event_table(cur)
-        ts = datetime.now().isoformat(timespec="seconds")
-        cur.execute(
-            "INSERT INTO events(timestamp, event, user, details) VALUES (?, 'first_run', '', '')",
-            (ts,),
-        )
-        conn.commit()
+        conn = _get_conn()
+        with _WRITE_LOCK, conn:
+            cur = conn.cursor()
+            ts = _now_iso()
+            cur.execute(
+                "INSERT INTO events(timestamp, event, user, details) VALUES (?, 'first_run', '', '')",
+                (ts,),
+            )
         log("First run logged", "INFO")
     except Exception as exc:
         log(f"Failed to log first run: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def log_voice_verification(user: str, success: bool) -> None:
     try:
-        conn = _connect()
-        cur = conn.cursor()
-        _ensure_event_table(cur)
-        ts = datetime.now().isoformat(timespec="seconds")
-        cur.execute(
-            "INSERT INTO events(timestamp, event, user, details) VALUES (?, 'voice', ?, ?)",
-            (ts, user, "success" if success else "fail"),
-        )
-        conn.commit()
+        conn = _get_conn()
+        with _WRITE_LOCK, conn:
+            cur = conn.cursor()
+            ts = _now_iso()
+            cur.execute(
+                "INSERT INTO events(timestamp, event, user, details) VALUES (?, 'voice', ?, ?)",
+                (ts, user, "success" if success else "fail"),
+            )
     except Exception as exc:
         log(f"Failed to log voice verification: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 
 def log_tamper(details: str) -> None:
     try:
-        conn = _connect()
-        cur = conn.cursor()
-        _ensure_event_table(cur)
-        ts = datetime.now().isoformat(timespec="seconds")
-        cur.execute(
-            "INSERT INTO events(timestamp, event, user, details) VALUES (?, 'tamper', '', ?)",
-            (ts, details),
-        )
-        conn.commit()
+        conn = _get_conn()
+        with _WRITE_LOCK, conn:
+            cur = conn.cursor()
+            ts = _now_iso()
+            cur.execute(
+                "INSERT INTO events(timestamp, event, user, details) VALUES (?, 'tamper', '', ?)",
+                (ts, details),
+            )
         log("Tamper event logged", "GUARD")
     except Exception as exc:
         log(f"Failed to log tamper: {exc}", "ERROR")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
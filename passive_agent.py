@@ -8,6 +8,7 @@ for more sophisticated strategies.
 
 from typing import List
 
+import numpy as np
 import yfinance as yf
 
 
@@ -21,7 +22,9 @@ class PassiveTradingAgent:
         """Return a list of closing prices for ``symbol``."""
 
         print(f"[TRADER] Fetching prices for {self.symbol} ({period})")
-        data = yf.download(self.symbol, period=period, progress=False)
+        # A single ticker gains nothing from yfinance's download threads, which
+        # are polled in a sleep loop until they finish.
+        data = yf.download(self.symbol, period=period, progress=False, threads=False)
         closes = data["Close"].tolist()
         return closes
 
@@ -30,25 +33,29 @@ class PassiveTradingAgent:
 
         if window <= 0:
             raise ValueError("window must be > 0")
-        avgs = []
-        for i in range(len(prices)):
-            if i + 1 < window:
-                avgs.append(sum(prices[: i + 1]) / (i + 1))
-            else:
-                avgs.append(sum(prices[i + 1 - window : i + 1]) / window)
-        return avgs
+        arr = np.asarray(prices, dtype=np.float64)
+        if arr.size == 0:
+            return []
+        csum = np.concatenate(([0.0], np.cumsum(arr)))
+        # The first ``window - 1`` entries average over the prices seen so far.
+        n_head = min(window - 1, arr.size)
+        head = csum[1 : n_head + 1] / np.arange(1, n_head + 1)
+        full = (csum[window:] - csum[:-window]) / window
+        return np.concatenate((head, full)).tolist()
 
     def run(self) -> None:
         """Fetch prices and print a very naive buy/hold decision."""
 
         prices = self.fetch_prices()
-        ma = self.moving_average(prices, window=5)
-        if prices[-1] > ma[-1]:
+        # Only the latest average is needed, which is the mean of the last
+        # five closes; no need to build the whole series.
+        ma = float(np.mean(prices[-5:]))
+        if prices[-1] > ma:
             action = "BUY"
         else:
             action = "HOLD"
         print(
-            f"[TRADER] Latest close: {prices[-1]:.2f}, 5-day MA: {ma[-1]:.2f} -> {action}"
+            f"[TRADER] Latest close: {prices[-1]:.2f}, 5-day MA: {ma:.2f} -> {action}"
         )
 
 
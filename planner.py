@@ -7,19 +7,74 @@ planning.
 """
 
 import ast
+import json
 import re
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from memory import query_memory, get_preference
 from logger import log
-from skill_loader import load_skills
+from skill_loader import load_skills, match_skills
+
+_SEARCH_RE = re.compile(r"search (for )?(?P<q>.+)")
+_URL_RE = re.compile(r"https?://\S+")
+_WORD_RE = re.compile(r"[a-z_]+")
+_SUFFIXES = ("ing", "ion", "ed", "er")
+
+# The openai module once imported, or False if it is not installed, so the
+# fallback path doesn't search sys.path again on every unmatched goal.
+_OPENAI = None
+
+
+def _get_openai():
+    global _OPENAI
+    if _OPENAI is None:
+        try:
+            import openai
+        except ImportError:
+            _OPENAI = False
+        else:
+            _OPENAI = openai
+    return _OPENAI or None
+
+
+def _tokens(g: str) -> Set[str]:
+    """Return the words of lower-cased goal ``g`` for keyword checks.
+
+    Plurals, verb endings and -ion/-er forms are folded back ("screenshots",
+    "emailed", "unzipping", "redaction") so the heuristics below can use set
+    membership.
+    """
+    toks: Set[str] = set()
+    for word in _WORD_RE.findall(g):
+        toks.add(word)
+        if word.endswith("es") and word[:-2].endswith(("ch", "sh", "ss", "x", "z")):
+            word = word[:-2]
+        elif word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+            word = word[:-1]
+        toks.add(word)
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) > len(suffix) + 2:
+                stem = word[: -len(suffix)]
+                toks.add(stem)
+                # "unzipping" -> "unzipp" -> "unzip"
+                if stem[-1] == stem[-2] and stem[-1] not in "aeiou":
+                    toks.add(stem[:-1])
+                break
+    return toks
 
 
 def parse_plan_string(plan_text: str) -> List[Dict[str, object]]:
     """Parse a plan string into a list of step dictionaries."""
 
     try:
-        plan = ast.literal_eval(plan_text)
+        plan = json.loads(plan_text)
+    except json.JSONDecodeError:
+        # Older plans were written as Python literals (None, True, single
+        # quotes), which only ``literal_eval`` understands.
+        try:
+            plan = ast.literal_eval(plan_text)
+        except Exception as exc:
+            raise ValueError(f"Invalid plan string: {exc}") from exc
     except Exception as exc:
         raise ValueError(f"Invalid plan string: {exc}") from exc
     if not isinstance(plan, list):
@@ -36,13 +91,19 @@ def generate_plan(goal: str, user: str) -> List[Dict[str, object]]:
     # Check past memory for similar goals
     history = query_memory(goal, user=user)
     if history:
-        log("Found similar past goals:")
-        for ts, gtext, res in history:
-            log(f"  {ts}: {gtext} -> {res}")
+        log("Found similar past goals:\n" + "\n".join(f"  {ts}: {gtext} -> {res}" for ts, gtext, res in history))
 
-    # Skills take priority if one can handle it
+    # Skills take priority if one can handle it. Skills that declare EXAMPLES
+    # are only asked when their examples resemble the goal, best match first;
+    # the rest are asked in load order as before.
     skills = load_skills()
-    for name, mod in skills.items():
+    ranked = match_skills(goal) if skills else None
+    if ranked is None:
+        candidates = list(skills)
+    else:
+        candidates = ranked + [n for n, m in skills.items() if not getattr(m, "EXAMPLES", None)]
+    for name in candidates:
+        mod = skills[name]
         try:
             if mod.can_handle(goal):
                 log(f"Skill {name} will handle goal", "SKILL")
@@ -55,9 +116,10 @@ def generate_plan(goal: str, user: str) -> List[Dict[str, object]]:
             log(f"Skill {name} check failed: {exc}", "ERROR")
 
     # Keyword search-based heuristics
+    toks = _tokens(g)
 
-    if "search" in g or "look up" in g:
-        query_match = re.search(r"search (for )?(?P<q>.+)", g)
+    if "search" in toks or "look up" in g:
+        query_match = _SEARCH_RE.search(g)
         query = query_match.group("q") if query_match else goal
         plan.append({
             "agent": "web_search",
@@ -65,8 +127,8 @@ def generate_plan(goal: str, user: str) -> List[Dict[str, object]]:
             "params": {"query": query, "user": user}
         })
 
-    url_match = re.search(r"https?://\S+", goal)
-    if "download" in g and url_match:
+    url_match = _URL_RE.search(goal)
+    if "download" in toks and url_match:
         url = url_match.group(0)
         plan.append({
             "agent": "file_downloader",
@@ -74,7 +136,7 @@ def generate_plan(goal: str, user: str) -> List[Dict[str, object]]:
             "params": {"url": url, "user": user}
         })
         download_idx = len(plan) - 1
-        if "extract" in g or "unzip" in g:
+        if "extract" in toks or "unzip" in toks:
             plan.append({
                 "agent": "file_downloader",
                 "action": "extract_file",
@@ -85,7 +147,7 @@ def generate_plan(goal: str, user: str) -> List[Dict[str, object]]:
                 },
             })
 
-    if ("go to" in g or "open" in g or "fill" in g) and url_match:
+    if ("go to" in g or "open" in toks or "fill" in toks) and url_match:
         steps = [{"action": "go_to", "url": url_match.group(0)}]
         plan.append({
             "agent": "browser_agent",
@@ -93,11 +155,11 @@ def generate_plan(goal: str, user: str) -> List[Dict[str, object]]:
             "params": {"task": {"steps": steps}, "user": user},
         })
 
-    if "screenshot" in g:
+    if "screenshot" in toks:
         plan.append({"agent": "file_agent", "action": "find_recent_screenshot", "params": {"user": user}})
         last_ref = "<result_from_step_0>"
 
-        if "text" in g or "ocr" in g:
+        if "text" in toks or "ocr" in toks:
             plan.append({
                 "agent": "utils.ocr",
                 "action": "extract_text",
@@ -105,7 +167,7 @@ def generate_plan(goal: str, user: str) -> List[Dict[str, object]]:
             })
             last_ref = f"<result_from_step_{len(plan)-1}>"
 
-        if "redact" in g:
+        if "redact" in toks:
             plan.append({
                 "agent": "file_agent",
                 "action": "redact_names",
@@ -113,8 +175,8 @@ def generate_plan(goal: str, user: str) -> List[Dict[str, object]]:
             })
             last_ref = f"<result_from_step_{len(plan)-1}>"
 
-        if "email" in g or "mail" in g:
-            recipient = "teacher@school.uk" if "teacher" in g else get_preference(user, "comms", "default_recipient") or "<recipient>"
+        if "email" in toks or "mail" in toks:
+            recipient = "teacher@school.uk" if "teacher" in toks else get_preference(user, "comms", "default_recipient") or "<recipient>"
             plan.append({
                 "agent": "comms_agent",
                 "action": "send_email",
@@ -129,8 +191,9 @@ def generate_plan(goal: str, user: str) -> List[Dict[str, object]]:
     # Fallback to LLM if nothing matches
     if not plan:
         try:
-            import openai
-            import json
+            openai = _get_openai()
+            if openai is None:
+                raise RuntimeError("openai package not installed")
             log("Using GPT-4 for plan generation")
             completion = openai.ChatCompletion.create(
                 model="gpt-4",
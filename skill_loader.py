@@ -1,36 +1,121 @@
 """Dynamic loading of optional skill modules."""
 
 import importlib.util
+import os
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from logger import log
 
 _LOADED: Dict[str, Any] = {}
+# mtime of the skills directory at the last completed scan. Adding, removing
+# or renaming a skill file changes it; editing a file in place does not, so
+# in-place edits are not picked up. An edited file is only executed again if
+# some later directory change triggers a rescan.
+_DIR_MTIME: Optional[int] = None
+_LOAD_LOCK = threading.Lock()
+# st_mtime_ns of each skill file when it was last tried, loaded or not, so
+# unchanged files are never executed twice.
+_SIGS: Dict[str, int] = {}
+
+# TF-IDF index over the optional ``EXAMPLES`` phrases of loaded skills, as
+# ``(vectorizer, matrix, skill names)``; rebuilt lazily after skills change.
+_STALE = object()
+_EXAMPLE_INDEX: Any = _STALE
 
 
 def load_skills() -> Dict[str, Any]:
-    """Discover skills in the ``skills`` directory and load them."""
+    """Discover skills in the ``skills`` directory and load them.
+
+    The directory is only rescanned when its modification time changes.
+    """
+    global _DIR_MTIME
     skills_dir = Path("skills")
-    skills_dir.mkdir(exist_ok=True)
-    for file in skills_dir.glob("*.py"):
-        name = file.stem
-        if name in _LOADED:
+    try:
+        mtime = skills_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        skills_dir.mkdir(exist_ok=True)
+        mtime = skills_dir.stat().st_mtime_ns
+    if mtime == _DIR_MTIME:
+        return _LOADED
+    with _LOAD_LOCK:
+        if mtime != _DIR_MTIME:
+            _scan_skills(skills_dir)
+            # Set only once the scan is complete, so concurrent callers never
+            # take the fast path above while _LOADED is still being filled.
+            _DIR_MTIME = mtime
+    return _LOADED
+
+
+def _scan_skills(skills_dir: Path) -> None:
+    global _EXAMPLE_INDEX
+    with os.scandir(skills_dir) as it:
+        entries = [e for e in it if e.name.endswith(".py") and e.is_file()]
+    for entry in entries:
+        name = entry.name[:-3]
+        try:
+            sig = entry.stat().st_mtime_ns
+        except OSError:
             continue
+        if _SIGS.get(name) == sig:
+            continue
+        _SIGS[name] = sig
         try:
-            spec = importlib.util.spec_from_file_location(name, file)
+            spec = importlib.util.spec_from_file_location(name, entry.path)
             if not spec or not spec.loader:
                 continue
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
             if hasattr(module, "can_handle") and hasattr(module, "execute"):
                 _LOADED[name] = module
+                _EXAMPLE_INDEX = _STALE
                 log(f"Loaded skill {name}", "SKILL")
             else:
                 log(f"Skipping {name}, missing interface", "WARNING")
         except Exception as exc:
             log(f"Failed to load skill {name}: {exc}", "ERROR")
-    return _LOADED
+
+
+def _build_example_index():
+    names: List[str] = []
+    texts: List[str] = []
+    for name, module in _LOADED.items():
+        for example in getattr(module, "EXAMPLES", None) or ():
+            names.append(name)
+            texts.append(example)
+    if not texts:
+        return None
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vect = TfidfVectorizer().fit(texts)
+    return vect, vect.transform(texts), names
+
+
+def match_skills(goal: str) -> Optional[List[str]]:
+    """Rank skills by how closely their ``EXAMPLES`` resemble ``goal``.
+
+    Returns the names of skills with at least one similar example, best
+    match first, or ``None`` when no ranking is possible (no skill defines
+    examples or scikit-learn is unavailable).
+    """
+    global _EXAMPLE_INDEX
+    if _EXAMPLE_INDEX is _STALE:
+        try:
+            _EXAMPLE_INDEX = _build_example_index()
+        except Exception as exc:
+            log(f"Skill example index unavailable: {exc}", "WARNING")
+            _EXAMPLE_INDEX = None
+    if _EXAMPLE_INDEX is None:
+        return None
+    vect, mat, names = _EXAMPLE_INDEX
+    # Rows are L2-normalised, so the dot product is the cosine similarity.
+    sims = (mat @ vect.transform([goal]).T).toarray().ravel()
+    best: Dict[str, float] = {}
+    for name, sim in zip(names, sims):
+        if sim > best.get(name, 0.0):
+            best[name] = sim
+    return sorted(best, key=best.get, reverse=True)
 
 
 def get_skill(name: str):
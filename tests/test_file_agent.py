@@ -31,3 +31,9 @@ def test_find_recent_screenshot(monkeypatch, tmp_path):
     path = find_recent_screenshot()
     assert Path(path).exists()
 
+
+def test_merge_boxes_unions_overlapping_and_adjacent():
+    boxes = [(0, 0, 10, 10), (12, 0, 20, 10), (100, 100, 110, 110)]
+    merged = file_agent._merge_boxes(boxes, gap=4)
+    assert merged == [(0, 0, 20, 10), (100, 100, 110, 110)]
+    assert file_agent._merge_boxes(boxes) == sorted(boxes)
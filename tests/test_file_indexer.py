@@ -0,0 +1,45 @@
+from file_indexer import build_file_index, search_index
+
+
+def test_search_index_filters_keywords_and_type(tmp_path, monkeypatch):
+    monkeypatch.setattr("file_indexer.DB_PATH", tmp_path / "index.db")
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "Budget_2024.pdf").write_text("x")
+    (docs / "budget notes.txt").write_text("x")
+    (docs / "holiday.png").write_text("x")
+    (docs / "budget.bin").write_text("x")
+    build_file_index([str(docs)])
+
+    found = sorted(search_index(["budget"]))
+    assert found == [str(docs / "Budget_2024.pdf"), str(docs / "budget notes.txt")]
+    assert search_index(["budget"], "PDF") == [str(docs / "Budget_2024.pdf")]
+    assert search_index(["budget", "notes"]) == [str(docs / "budget notes.txt")]
+    # LIKE wildcards in keywords are matched literally
+    assert search_index(["%"]) == []
+    assert search_index(["t_2"]) == [str(docs / "Budget_2024.pdf")]
+
+
+def test_search_index_folds_unicode_case(tmp_path, monkeypatch):
+    monkeypatch.setattr("file_indexer.DB_PATH", tmp_path / "index.db")
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "Über Plan.pdf").write_text("x")
+    build_file_index([str(docs)])
+    assert search_index(["über"]) == [str(docs / "Über Plan.pdf")]
+    assert search_index(["ÜBER"]) == [str(docs / "Über Plan.pdf")]
+
+
+def test_existing_index_gains_folded_names(tmp_path, monkeypatch):
+    import sqlite3
+
+    db = tmp_path / "old.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE files (path TEXT PRIMARY KEY, name TEXT, size INTEGER, mtime REAL, type TEXT)"
+    )
+    conn.execute("INSERT INTO files VALUES ('/x/Über.pdf', 'Über.pdf', 1, 0, 'pdf')")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr("file_indexer.DB_PATH", db)
+    assert search_index(["über"]) == ["/x/Über.pdf"]
@@ -0,0 +1,100 @@
+import logging
+
+from logger import BufferedRotatingFileHandler
+
+
+def test_buffered_handler_batches_and_rotates(tmp_path):
+    path = tmp_path / "t.log"
+    handler = BufferedRotatingFileHandler(path, maxBytes=2000, backupCount=2, flush_interval=3600)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger("test_buffered_handler")
+    logger.propagate = False
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        logger.info("first")
+        assert path.read_text() == ""  # still buffered
+        logger.warning("urgent")
+        assert path.read_text() == "first\nurgent\n"
+        for i in range(500):
+            logger.info("line %03d", i)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert (tmp_path / "t.log.1").stat().st_size <= 2000
+    assert path.read_text().splitlines()[-1] == "line 499"
+
+
+def test_buffered_handler_counts_encoded_bytes(tmp_path):
+    path = tmp_path / "utf8.log"
+    handler = BufferedRotatingFileHandler(
+        path, maxBytes=1000, backupCount=1, flush_interval=3600, encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger("test_buffered_handler_utf8")
+    logger.propagate = False
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        for _ in range(40):
+            logger.info("\u00e9" * 20)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert (tmp_path / "utf8.log.1").stat().st_size <= 1000
+    assert path.stat().st_size <= 1000
+
+
+def test_listener_flushes_idle_handler(tmp_path):
+    import queue
+    import time
+    from logging.handlers import QueueHandler
+
+    from logger import _FlushingQueueListener
+
+    path = tmp_path / "idle.log"
+    handler = BufferedRotatingFileHandler(path, flush_interval=0.05)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    records = queue.SimpleQueue()
+    listener = _FlushingQueueListener(records, handler, flush_interval=0.05)
+    logger = logging.getLogger("test_buffered_handler_idle")
+    logger.propagate = False
+    logger.addHandler(QueueHandler(records))
+    logger.setLevel(logging.INFO)
+    listener.start()
+    try:
+        logger.info("quiet")
+        deadline = time.monotonic() + 2.0
+        while path.read_text() == "" and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert path.read_text() == "quiet\n"
+    finally:
+        listener.stop()
+        logger.handlers.clear()
+        handler.close()
+
+
+def test_flush_logs_drains_queued_records(tmp_path, monkeypatch):
+    import uuid
+
+    import logger
+
+    monkeypatch.setattr(logger, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(logger, "LOG_FILE", tmp_path / "ghosthand.log")
+    monkeypatch.setattr(logger, "_logger", None)
+    monkeypatch.setattr(logger, "_listener", None)
+    monkeypatch.setattr(logger, "_file_handler", None)
+    monkeypatch.setattr(logger, "_listener_running", False)
+    monkeypatch.setattr(logging.getLogger("ghosthand"), "handlers", [])
+
+    marker = f"flush-marker-{uuid.uuid4().hex}"
+    try:
+        for _ in range(5):
+            logger.log(marker)
+        logger.flush_logs()
+        assert (tmp_path / "ghosthand.log").read_text().count(marker) == 5
+    finally:
+        logger._stop_listener()
+        logger._file_handler.close()
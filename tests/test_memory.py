@@ -21,3 +21,54 @@ def test_goal_logging(tmp_path, monkeypatch):
     # query_memory should return similar goal
     res = query_memory("do stuff", "u1")
     assert res
+
+
+def test_query_memory_sees_goals_logged_after_first_query(tmp_path, monkeypatch):
+    db_path = tmp_path / "memory.db"
+    monkeypatch.setattr("memory.DB_PATH", db_path)
+    for i in range(4):
+        log_goal(f"send email to teacher {i}", "ok", "u1")
+    assert query_memory("email teacher", "u1")
+    log_goal("find screenshot", "ok", "u1")
+    res = query_memory("screenshot", "u1")
+    assert [r[1] for r in res] == ["find screenshot"]
+
+
+def test_query_memory_keyword_fallback(tmp_path, monkeypatch):
+    db_path = tmp_path / "memory.db"
+    monkeypatch.setattr("memory.DB_PATH", db_path)
+
+    def unavailable(*args):
+        raise ImportError("sklearn")
+
+    monkeypatch.setattr("memory._goal_index", unavailable)
+    log_goal("send email to teacher", "ok", "u1")
+    log_goal("find screenshot", "ok", "u1")
+    log_goal("email the team", "ok", "u2")
+    res = query_memory("email my teacher", "u1")
+    assert [r[1] for r in res] == ["send email to teacher"]
+
+
+def test_numba_kernel_matches_sparse_path(tmp_path, monkeypatch):
+    import numpy as np
+    import pytest
+
+    import memory
+
+    if memory._cosine_kernel() is None:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr("memory.DB_PATH", tmp_path / "memory.db")
+    words = ["send", "email", "teacher", "find", "screenshot", "open", "report", "zip"]
+    for i in range(40):
+        goal = " ".join(words[(i * k) % len(words)] for k in range(1, 4 + i % 3))
+        log_goal(goal, "ok", "u1")
+    conn = memory._get_conn()
+    index = memory._goal_index(conn.cursor(), "u1")
+
+    monkeypatch.setattr("memory._NUMBA_MIN_ROWS", 10 ** 9)
+    sparse = memory._goal_similarities(index, "email the teacher a screenshot")
+    monkeypatch.setattr("memory._NUMBA_MIN_ROWS", 0)
+    kernel = memory._goal_similarities(index, "email the teacher a screenshot")
+
+    assert sparse.max() > 0
+    np.testing.assert_allclose(kernel, sparse, rtol=1e-9, atol=1e-12)
@@ -0,0 +1,37 @@
+from planner import generate_plan, parse_plan_string
+
+
+def test_parse_plan_string_accepts_json_and_python_literals():
+    assert parse_plan_string('[{"agent": "a", "params": {"x": null}}]') == [{"agent": "a", "params": {"x": None}}]
+    assert parse_plan_string("[{'agent': 'a', 'params': {'x': None}}]") == [{"agent": "a", "params": {"x": None}}]
+
+
+def test_keyword_plan_matches_inflected_words(tmp_path, monkeypatch):
+    monkeypatch.setattr("memory.DB_PATH", tmp_path / "memory.db")
+    monkeypatch.setattr("planner.load_skills", lambda: {})
+    plan = generate_plan("Find my screenshots, redact the names and email them to my teacher", "u1")
+    assert [(s["agent"], s["action"]) for s in plan] == [
+        ("file_agent", "find_recent_screenshot"),
+        ("file_agent", "redact_names"),
+        ("comms_agent", "send_email"),
+    ]
+    assert plan[-1]["params"]["to"] == "teacher@school.uk"
+
+
+def test_tokens_fold_doubled_consonants_and_derived_forms():
+    from planner import _tokens
+
+    assert "unzip" in _tokens("try unzipping it")
+    assert "redact" in _tokens("apply redaction")
+    assert "redact" in _tokens("redacted copy")
+    assert "search" in _tokens("searches")
+    assert "fill" in _tokens("filled form")
+
+
+def test_keyword_plan_routes_unzipping_and_redaction(tmp_path, monkeypatch):
+    monkeypatch.setattr("memory.DB_PATH", tmp_path / "memory.db")
+    monkeypatch.setattr("planner.load_skills", lambda: {})
+    plan = generate_plan("Download https://example.com/a.zip and try unzipping it", "u1")
+    assert [s["action"] for s in plan] == ["download_file", "extract_file"]
+    plan = generate_plan("Take the screenshot and apply redaction", "u1")
+    assert [s["action"] for s in plan] == ["find_recent_screenshot", "redact_names"]
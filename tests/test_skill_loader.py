@@ -0,0 +1,41 @@
+import pytest
+
+import skill_loader
+
+SKILL = '''
+EXAMPLES = {examples!r}
+
+
+def can_handle(goal):
+    return True
+
+
+def execute(goal="", user=""):
+    return {name!r}
+'''
+
+
+@pytest.fixture
+def skills_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(skill_loader, "_LOADED", {})
+    monkeypatch.setattr(skill_loader, "_SIGS", {})
+    monkeypatch.setattr(skill_loader, "_DIR_MTIME", None)
+    monkeypatch.setattr(skill_loader, "_EXAMPLE_INDEX", skill_loader._STALE)
+    path = tmp_path / "skills"
+    path.mkdir()
+    return path
+
+
+def test_match_skills_ranks_by_examples(skills_dir):
+    pytest.importorskip("sklearn")
+    (skills_dir / "weather.py").write_text(
+        SKILL.format(name="weather", examples=["what is the weather today", "forecast for tomorrow"])
+    )
+    (skills_dir / "music.py").write_text(
+        SKILL.format(name="music", examples=["play some music", "next song"])
+    )
+    assert set(skill_loader.load_skills()) == {"weather", "music"}
+    assert skill_loader.match_skills("play a song") == ["music"]
+    assert skill_loader.match_skills("weather forecast") == ["weather"]
+    assert skill_loader.match_skills("send an email") == []
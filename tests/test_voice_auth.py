@@ -0,0 +1,105 @@
+import numpy as np
+
+import voice_auth
+
+
+def _use_store(tmp_path, monkeypatch, prints):
+    monkeypatch.setattr(voice_auth, "VOICEPRINT_DIR", tmp_path)
+    monkeypatch.setattr(voice_auth, "_VOICEPRINTS", None)
+    monkeypatch.setattr(voice_auth, "_RECENT", None)
+    store = voice_auth.VoiceprintStore(tmp_path)
+    for name, vec in prints.items():
+        store.add(name, vec)
+    return store
+
+
+def test_best_match_uses_cached_normalised_voiceprints(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    alice, bob = rng.normal(size=256), rng.normal(size=256)
+    store = _use_store(tmp_path, monkeypatch, {"alice": alice * 3.0, "bob": bob})
+
+    user, score = voice_auth._best_match(alice + 0.01 * rng.normal(size=256))
+    assert user == "alice" and score > 0.99
+
+    # An unchanged store is served from the cache.
+    cached = voice_auth._VOICEPRINTS
+    voice_auth._best_match(bob)
+    assert voice_auth._VOICEPRINTS is cached
+
+    carol = rng.normal(size=256)
+    store.add("carol", carol)
+    assert voice_auth._best_match(carol)[0] == "carol"
+
+
+def test_store_add_replaces_existing_row(tmp_path, monkeypatch):
+    store = _use_store(tmp_path, monkeypatch, {"alice": np.ones(4), "bob": -np.ones(4)})
+    store.add("alice", np.array([1.0, 0.0, 0.0, 0.0]))
+    users, mat = store.load()
+    assert users == ["alice", "bob"]
+    assert np.allclose(mat[0], [1.0, 0.0, 0.0, 0.0])
+    assert "bob" in store and "carol" not in store
+
+
+def test_best_match_int8_shortlist_rescores_exactly(tmp_path, monkeypatch):
+    rng = np.random.default_rng(1)
+    prints = rng.normal(size=(8, 256))
+    _use_store(tmp_path, monkeypatch, {f"user{i}": vec for i, vec in enumerate(prints)})
+    monkeypatch.setattr(voice_auth, "_INT8_MIN_PRINTS", 4)
+
+    sample = prints[5] + 0.05 * rng.normal(size=256)
+    user, score = voice_auth._best_match(sample)
+    expected = prints[5] @ sample / np.linalg.norm(prints[5]) / np.linalg.norm(sample)
+    assert user == "user5"
+    assert abs(score - expected) < 1e-5
+
+
+def test_legacy_npy_voiceprints_are_imported_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_auth, "VOICEPRINT_DIR", tmp_path)
+    np.save(tmp_path / "old.npy", np.arange(1.0, 5.0))
+    np.save(tmp_path / "new.npy", np.ones(4))
+    store = voice_auth.VoiceprintStore(tmp_path)
+
+    assert store.import_legacy() == 2
+    users, mat = store.load()
+    assert users == ["new", "old"]
+    assert np.allclose(np.linalg.norm(mat, axis=1), 1.0)
+    assert store.import_legacy() == 0
+    assert voice_auth.is_enrolled("old")
+
+
+def test_best_match_recent_user_shortcut_stays_exact(tmp_path, monkeypatch):
+    rng = np.random.default_rng(2)
+    base = rng.normal(size=64)
+    # Two deliberately similar voices and one unrelated.
+    carol = base + 0.6 * rng.normal(size=64)
+    _use_store(tmp_path, monkeypatch, {"alice": base, "carol": carol, "bob": rng.normal(size=64)})
+
+    assert voice_auth._best_match(base)[0] == "alice"
+    users, idx, bound = voice_auth._RECENT
+    assert users[idx] == "alice" and bound < 1.0
+
+    calls = []
+    monkeypatch.setattr(voice_auth, "_exclusive_bound", lambda *a: calls.append(a) or 2.0)
+    # The shortcut answers without a rescan when the sample is close enough.
+    assert voice_auth._best_match(base)[0] == "alice"
+    assert not calls
+
+    user, score = voice_auth._best_match(carol)
+    assert user == "carol" and score > 0.99
+
+
+def test_int8_scores_fall_back_when_simsimd_fails(monkeypatch):
+    import sys
+    import types
+
+    broken = types.ModuleType("simsimd")
+
+    def cdist(*args, **kwargs):
+        raise ValueError("unsupported metric")
+
+    broken.cdist = cdist
+    monkeypatch.setitem(sys.modules, "simsimd", broken)
+    rng = np.random.default_rng(3)
+    mat = rng.normal(size=(6, 32)).astype(np.float32)
+    scores = voice_auth._int8_scores(voice_auth._quantize(mat), mat[2])
+    assert int(scores.argmax()) == 2
@@ -0,0 +1,76 @@
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("lxml")
+
+import web_search  # noqa: E402
+
+_PAGE = (
+    '<html><head><title>q</title></head><body><div class="header">x</div>'
+    + "".join(
+        f'<div class="result results_links"><div class="links_main result__body">'
+        f'<a class="result__a" href="https://e.com/{i}">Title {i}</a>'
+        f'<a class="result__snippet">snippet <b>{i}</b></a></div></div>'
+        for i in range(5)
+    )
+    + "</body></html>"
+).encode()
+
+
+def test_parse_stream_stops_after_three_results():
+    chunks = [_PAGE[i:i + 50] for i in range(0, len(_PAGE), 50)]
+    consumed = []
+
+    def feed():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    links, snippets = web_search._parse_stream(feed())
+    assert links == [f"https://e.com/{i}" for i in range(3)]
+    assert snippets == ["snippet 0", "snippet 1", "snippet 2"]
+    assert len(consumed) < len(chunks)
+
+
+def test_parsers_agree():
+    pytest.importorskip("selectolax")
+    pytest.importorskip("bs4")
+    page = _PAGE.replace(b"snippet <b>", b"snippet\n  <b>")
+    expected = web_search._parse_stream([page])
+    assert web_search._parse_lexbor(page) == expected
+    assert web_search._parse_soup(page.decode()) == expected
+
+
+def test_search_web_caches_recent_queries(monkeypatch):
+    calls = []
+
+    class _Resp:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        content = _PAGE
+
+        def iter_content(self, size):
+            yield _PAGE
+
+    def fake_get(url, params=None, **kwargs):
+        calls.append(params["q"])
+        return _Resp()
+
+    monkeypatch.setattr(web_search._SESSION, "get", fake_get)
+    monkeypatch.setattr(web_search, "_CACHE", web_search.OrderedDict())
+    first = web_search.search_web("ghosts")
+    first["top_links"].clear()
+    again = web_search.search_web("ghosts")
+    assert calls == ["ghosts"]
+    assert len(again["top_links"]) == 3
+
+    monkeypatch.setattr(web_search, "SEARCH_TTL", 0.0)
+    web_search.search_web("ghosts")
+    assert calls == ["ghosts", "ghosts"]
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 from logger import log
@@ -13,6 +18,325 @@ from logger import log
 VOICEPRINT_DIR = Path("voiceprints")
 VOICEPRINT_DIR.mkdir(exist_ok=True)
 
+MATCH_THRESHOLD = 0.75
+
+# Enrolled voiceprints as one L2-normalised float32 matrix, keyed by the
+# signature of the VoiceprintStore it was read from. Large
+# enrolments also keep an int8 copy with per-row scales for a coarse first
+# pass; the final score is always computed in float32.
+_VOICEPRINTS: Optional[tuple] = None
+_VOICEPRINTS_LOCK = threading.Lock()
+_STORE_LOCK = threading.Lock()
+_INT8_MIN_PRINTS = 256
+_INT8_CANDIDATES = 4
+_MIGRATED = False
+
+# ``(users, index, bound)`` for the last verified user. If the sample's
+# cosine to that print exceeds ``bound`` no other print can score higher,
+# so the full scan is skipped.
+_RECENT: Optional[Tuple[List[str], int, float]] = None
+
+# Embeddings of recently seen recordings keyed by a digest of the samples, so
+# a clip that is verified and then enrolled is only encoded once.
+_EMBED_CACHE: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+_EMBED_CACHE_MAX = 8
+_EMBED_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoder():
+    """Load the Resemblyzer encoder once per process, on the GPU if present."""
+    import torch
+    from resemblyzer import VoiceEncoder
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    log(f"Loading voice encoder on {device}", "GUARD")
+    return VoiceEncoder(device=device, verbose=False)
+
+
+def _quantize(mat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric int8 quantisation of each row of ``mat`` with its scale."""
+    scales = np.abs(mat).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    return np.round(mat / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def _int8_dot_kernel():
+    """Return a numba-compiled int8 GEMV, or ``None`` without numba.
+
+    Products are accumulated in int32 straight from the int8 rows, so the
+    matrix is not widened to a temporary copy on every verification.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def kernel(mat8, q8):
+        out = np.empty(mat8.shape[0], dtype=np.int32)
+        for r in range(mat8.shape[0]):
+            acc = np.int32(0)
+            for i in range(mat8.shape[1]):
+                acc += np.int32(mat8[r, i]) * np.int32(q8[i])
+            out[r] = acc
+        return out
+
+    return kernel
+
+
+def _int8_scores(quant: Tuple[np.ndarray, np.ndarray], q: np.ndarray) -> np.ndarray:
+    """Approximate ``mat @ q`` from the int8 copy of the voiceprints.
+
+    ``simsimd`` dispatches to VNNI/AVX2/NEON int8 dot products when it is
+    installed; numba's kernel is the next choice, and plain NumPy int32
+    arithmetic the last.
+    """
+    mat8, scales = quant
+    q8, q_scale = _quantize(q[None, :])
+    raw = None
+    try:
+        import simsimd
+
+        raw = np.asarray(simsimd.cdist(q8, mat8, metric="dot"))[0]
+    except ImportError:
+        pass
+    except Exception as exc:  # unsupported build, dtype or metric
+        log(f"simsimd int8 scoring failed, using fallback: {exc}", "WARNING")
+    if raw is None:
+        kernel = _int8_dot_kernel()
+        if kernel is not None:
+            raw = kernel(mat8, q8[0])
+        else:
+            raw = mat8.astype(np.int32) @ q8[0].astype(np.int32)
+    return raw * scales * q_scale[0]
+
+
+def _fast_preprocess(wav: np.ndarray, sr: int) -> np.ndarray:
+    """Resemblyzer's ``preprocess_wav`` without work our recordings don't need.
+
+    Samples recorded by :func:`record_voice_sample` are already 16 kHz
+    mono, so they only get volume normalisation and silence trimming.
+    Anything else goes through ``preprocess_wav`` after a mono downmix.
+    """
+    from resemblyzer import audio, preprocess_wav
+    from resemblyzer.hparams import audio_norm_target_dBFS, sampling_rate
+
+    if wav.ndim > 1:
+        wav = wav.mean(axis=1, dtype=np.float32)
+    if sr != sampling_rate:
+        return preprocess_wav(wav, sr)
+    wav = audio.normalize_volume(wav, audio_norm_target_dBFS, increase_only=True)
+    return audio.trim_long_silences(wav)
+
+
+def _embed(audio_path: str) -> np.ndarray:
+    """Return the Resemblyzer embedding of the recording at ``audio_path``."""
+    import soundfile as sf
+
+    wav, sr = sf.read(audio_path, dtype="float32")
+    key = hashlib.blake2b(wav.tobytes(), digest_size=16, key=str(sr).encode()).digest()
+    with _EMBED_LOCK:
+        hit = _EMBED_CACHE.get(key)
+        if hit is not None:
+            _EMBED_CACHE.move_to_end(key)
+            return hit
+
+    embed = _get_encoder().embed_utterance(_fast_preprocess(wav, sr))
+    embed.setflags(write=False)
+    with _EMBED_LOCK:
+        _EMBED_CACHE[key] = embed
+        while len(_EMBED_CACHE) > _EMBED_CACHE_MAX:
+            _EMBED_CACHE.popitem(last=False)
+    return embed
+
+
+def _unit(embed: np.ndarray) -> np.ndarray:
+    """Return ``embed`` as a flat float32 vector of unit length."""
+    embed = np.asarray(embed, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(embed))
+    return embed / norm if norm > 0 else embed
+
+
+class VoiceprintStore:
+    """Enrolled voiceprints kept as one float32 matrix file plus a user index.
+
+    ``voiceprints.bin`` holds one unit-length row per user in the order of
+    the ``users`` list in ``users.json``. Rows are appended before the index
+    is replaced, so a reader never sees a user without a voiceprint.
+    """
+
+    BIN_NAME = "voiceprints.bin"
+    INDEX_NAME = "users.json"
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.bin_path = self.directory / self.BIN_NAME
+        self.index_path = self.directory / self.INDEX_NAME
+
+    def signature(self) -> tuple:
+        """Return a cheap fingerprint that changes when the store is written."""
+        try:
+            return tuple(
+                (st.st_mtime_ns, st.st_size)
+                for st in (os.stat(self.index_path), os.stat(self.bin_path))
+            )
+        except OSError:
+            return ()
+
+    def _read_index(self) -> dict:
+        try:
+            return json.loads(self.index_path.read_text())
+        except FileNotFoundError:
+            return {"dim": 0, "users": []}
+
+    def _write_index(self, index: dict) -> None:
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, self.index_path)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._read_index()["users"]
+
+    def load(self) -> Tuple[List[str], np.ndarray]:
+        """Read all usernames and their voiceprints with a single file read."""
+        try:
+            index = self._read_index()
+        except (OSError, ValueError) as exc:
+            log(f"Voiceprint index unreadable: {exc}", "ERROR")
+            return [], np.empty((0, 0), dtype=np.float32)
+        users, dim = list(index["users"]), int(index["dim"])
+        if not users:
+            return [], np.empty((0, 0), dtype=np.float32)
+        try:
+            flat = np.fromfile(self.bin_path, dtype=np.float32, count=len(users) * dim)
+        except OSError as exc:
+            log(f"Voiceprint store unreadable: {exc}", "ERROR")
+            return [], np.empty((0, 0), dtype=np.float32)
+        rows = flat.size // dim
+        if rows < len(users):
+            log(f"Voiceprint store truncated: {rows} of {len(users)} rows", "ERROR")
+            users = users[:rows]
+        return users, flat[: rows * dim].reshape(rows, dim)
+
+    def add(self, username: str, embed: np.ndarray) -> None:
+        """Store ``embed`` for ``username``, replacing any previous voiceprint."""
+        embed = _unit(embed)
+        with _STORE_LOCK:
+            self.directory.mkdir(exist_ok=True)
+            index = self._read_index()
+            users = index["users"]
+            dim = index["dim"] or embed.size
+            if embed.size != dim:
+                raise ValueError(f"voiceprint has {embed.size} values, store expects {dim}")
+            if username in users:
+                rows = np.memmap(self.bin_path, dtype=np.float32, mode="r+", shape=(len(users), dim))
+                rows[users.index(username)] = embed
+                rows.flush()
+                del rows
+            else:
+                with open(self.bin_path, "ab") as fh:
+                    # Drop any row left behind by an append that never made
+                    # it into the index.
+                    fh.truncate(len(users) * dim * 4)
+                    fh.write(embed.tobytes())
+                users.append(username)
+            self._write_index({"dim": dim, "users": users})
+
+    def import_legacy(self) -> int:
+        """Copy per-user ``.npy`` voiceprints into a store that does not exist yet.
+
+        The ``.npy`` files are left in place. Returns the number imported.
+        """
+        if self.index_path.exists():
+            return 0
+        count = 0
+        for path in sorted(self.directory.glob("*.npy")):
+            try:
+                self.add(path.stem, np.load(path))
+            except Exception as exc:
+                log(f"Skipping voiceprint {path}: {exc}", "WARNING")
+                continue
+            count += 1
+        if count:
+            log(f"Imported {count} voiceprints into {self.bin_path}", "GUARD")
+        return count
+
+
+def _store() -> VoiceprintStore:
+    return VoiceprintStore(VOICEPRINT_DIR)
+
+
+def _voiceprint_matrix():
+    """Return enrolled usernames, their unit-length voiceprints and the
+    optional int8 copy used to shortlist candidates.
+
+    The store is only read again after it has been written.
+    """
+    global _VOICEPRINTS, _MIGRATED
+    store = _store()
+    if not _MIGRATED:
+        store.import_legacy()
+        _MIGRATED = True
+    sig = store.signature()
+
+    with _VOICEPRINTS_LOCK:
+        if _VOICEPRINTS is not None and _VOICEPRINTS[0] == sig:
+            return _VOICEPRINTS[1:]
+
+        users, mat = store.load()
+        quant = _quantize(mat) if len(users) >= _INT8_MIN_PRINTS else None
+        _VOICEPRINTS = (sig, users, mat, quant)
+        return users, mat, quant
+
+
+def _exclusive_bound(mat: np.ndarray, idx: int) -> float:
+    """Cosine above which row ``idx`` is provably the best match.
+
+    With ``m`` the highest similarity between row ``idx`` and any other row,
+    a sample within half that angle of row ``idx`` is closer to it than to
+    every other row: ``cos(arccos(m) / 2) == sqrt((1 + m) / 2)``.
+    """
+    sims = mat @ mat[idx]
+    sims[idx] = -1.0
+    m = float(sims.max()) if len(sims) > 1 else -1.0
+    return float(np.sqrt((1.0 + min(m, 1.0)) / 2.0)) + 1e-6
+
+
+def _best_match(sample_embed: np.ndarray) -> Tuple[str, float]:
+    """Return the enrolled user closest to ``sample_embed`` and the score."""
+    global _RECENT
+    users, mat, quant = _voiceprint_matrix()
+    q = np.asarray(sample_embed, dtype=np.float32).ravel()
+    norm = float(np.sqrt(q @ q))
+    if not users or norm == 0 or q.shape[0] != mat.shape[1]:
+        return "unknown", 0.0
+    recent = _RECENT
+    if recent is not None and recent[0] is users:
+        score = float(mat[recent[1]] @ q) / norm
+        if score > recent[2]:
+            return users[recent[1]], score
+    # Stored rows are unit length, so one GEMV against the raw sample and a
+    # scalar divide gives the cosines; the sample is never copied.
+    if quant is None:
+        scores = mat @ q
+        best = idx = int(scores.argmax())
+    else:
+        # Shortlist with int8 scores, then rescore exactly so the threshold
+        # is never applied to an approximation.
+        approx = _int8_scores(quant, q)
+        cand = np.argpartition(approx, -_INT8_CANDIDATES)[-_INT8_CANDIDATES:]
+        scores = mat[cand] @ q
+        best = int(scores.argmax())
+        idx = int(cand[best])
+    score = float(scores[best]) / norm
+    if score <= 0:
+        return "unknown", 0.0
+    if score >= MATCH_THRESHOLD and (recent is None or recent[0] is not users or recent[1] != idx):
+        _RECENT = (users, idx, _exclusive_bound(mat, idx))
+    return users[idx], score
+
 
 def enroll_user(username: str, audio_path: str) -> str:
     """Enroll a new user using a short WAV sample.
@@ -27,26 +351,22 @@ def enroll_user(username: str, audio_path: str) -> str:
     Returns
     -------
     str
-        Path to the saved voiceprint.
+        Path to the voiceprint store.
     """
     log(f"Enrolling voice for {username}", "GUARD")
     try:
-        from resemblyzer import VoiceEncoder, preprocess_wav
-        import soundfile as sf
-
-        wav, sr = sf.read(audio_path)
-        wav = preprocess_wav(wav, sr)
-        encoder = VoiceEncoder()
-        embed = encoder.embed_utterance(wav)
+        embed = _embed(audio_path)
     except Exception as exc:  # pragma: no cover - optional heavy deps
         log(f"Voice enrollment failed: {exc}", "ERROR")
         raise
 
-    VOICEPRINT_DIR.mkdir(exist_ok=True)
-    out_path = VOICEPRINT_DIR / f"{username}.npy"
-    np.save(out_path, embed)
+    global _VOICEPRINTS
+    store = _store()
+    store.add(username, embed)
+    # mtime granularity may hide a rewrite within the same tick.
+    _VOICEPRINTS = None
     log(f"Enrollment successful for {username}", "GUARD")
-    return str(out_path)
+    return str(store.bin_path)
 
 
 def verify_user(audio_path: str) -> str:
@@ -63,31 +383,14 @@ def verify_user(audio_path: str) -> str:
         Best matching username or ``"unknown"``.
     """
     try:
-        from resemblyzer import VoiceEncoder, preprocess_wav
-        import soundfile as sf
-
-        wav, sr = sf.read(audio_path)
-        wav = preprocess_wav(wav, sr)
-        encoder = VoiceEncoder()
-        sample_embed = encoder.embed_utterance(wav)
+        sample_embed = _embed(audio_path)
     except Exception as exc:  # pragma: no cover
         log(f"Voice verification failed: {exc}", "ERROR")
         return "unknown"
 
-    best_user = "unknown"
-    best_score = 0.0
-    for vp in VOICEPRINT_DIR.glob("*.npy"):
-        try:
-            embed = np.load(vp)
-            score = float(np.dot(sample_embed, embed) / (np.linalg.norm(sample_embed) * np.linalg.norm(embed)))
-            if score > best_score:
-                best_score = score
-                best_user = vp.stem
-        except Exception:
-            continue
-
+    best_user, best_score = _best_match(sample_embed)
     log(f"Voice verification score {best_score:.2f} for {best_user}", "GUARD")
-    if best_score >= 0.75:
+    if best_score >= MATCH_THRESHOLD:
         return best_user
     return "unknown"
 
@@ -104,9 +407,9 @@ def record_voice_sample(save_path: str, seconds: int = 5) -> None:
 
     fs = 16000
     try:
-        audio = sd.rec(int(seconds * fs), samplerate=fs, channels=1)
+        audio = sd.rec(int(seconds * fs), samplerate=fs, channels=1, dtype="float32")
         sd.wait()
-        sf.write(save_path, audio, fs)
+        sf.write(save_path, audio, fs, subtype="PCM_16")
     except Exception as exc:
         log(f"Recording failed: {exc}", "ERROR")
         raise
@@ -114,4 +417,6 @@ def record_voice_sample(save_path: str, seconds: int = 5) -> None:
 
 def is_enrolled(username: str) -> bool:
     """Return ``True`` if a voiceprint for ``username`` exists."""
-    return (VOICEPRINT_DIR / f"{username}.npy").exists()
+    store = _store()
+    store.import_legacy()
+    return username in store
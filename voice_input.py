@@ -1,16 +1,58 @@
 """Voice input utilities for Ghosthand.
 
 This module records audio from the microphone and transcribes it using
-OpenAI Whisper. Recording is limited to a short duration so it can be
-used from the command line or GUI without additional interaction.
+Whisper, through ``faster-whisper`` when it is installed. Recording is
+limited to a short duration so it can be used from the command line or GUI
+without additional interaction.
 """
 
-from pathlib import Path
-import tempfile
+import functools
 
 from logger import log
 
 
+WHISPER_MODEL = "base"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_model(name: str = WHISPER_MODEL, device=None):
+    """Load a speech model once per ``(name, device)``.
+
+    ``faster-whisper`` (CTranslate2) is preferred: int8 weights on CPU and
+    float16 on CUDA. The reference PyTorch Whisper is used when it is not
+    installed.
+    """
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        import whisper
+
+        return whisper.load_model(name, device=device)
+
+    if device is None:
+        import ctranslate2
+
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    compute_type = "float16" if device == "cuda" else "int8"
+    log(f"Loading {name} on {device} ({compute_type})")
+    return WhisperModel(name, device=device, compute_type=compute_type)
+
+
+def _transcribe(model, audio) -> str:
+    """Run ``model`` on 16 kHz mono float32 ``audio`` and return the text.
+
+    The spoken language is detected by the model, as before.
+    """
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        WhisperModel = None
+    if WhisperModel is not None and isinstance(model, WhisperModel):
+        segments, _ = model.transcribe(audio)
+        return " ".join(seg.text.strip() for seg in segments).strip()
+    return model.transcribe(audio).get("text", "").strip()
+
+
 def listen_and_transcribe(duration: int = 10) -> str:
     """Record from the microphone and return the transcribed text.
 
@@ -28,37 +70,27 @@ def listen_and_transcribe(duration: int = 10) -> str:
     log(f"Recording for {duration}s ...")
     try:
         import sounddevice as sd
-        import soundfile as sf
     except Exception as exc:  # pragma: no cover - optional dependency
         log(f"Audio capture unavailable: {exc}", "ERROR")
         return ""
 
+    # Whisper takes 16 kHz mono float32 samples directly, so the recording
+    # is handed over in memory instead of via a WAV file and ffmpeg.
     fs = 16000
     try:
-        audio = sd.rec(int(duration * fs), samplerate=fs, channels=1)
+        audio = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype="float32")
         sd.wait()
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            sf.write(tmp.name, audio, fs)
-            wav_path = tmp.name
+        audio = audio.reshape(-1)
     except Exception as exc:
         log(f"Recording failed: {exc}", "ERROR")
         return ""
 
     log("Transcribing audio ...")
     try:
-        import whisper
-
-        model = whisper.load_model("base")
-        result = model.transcribe(wav_path)
-        text = result.get("text", "").strip()
+        text = _transcribe(_get_model(), audio)
     except Exception as exc:
         log(f"Transcription failed: {exc}", "ERROR")
         text = ""
-    finally:
-        try:
-            Path(wav_path).unlink(missing_ok=True)
-        except Exception:
-            pass
 
     log(f"Transcribed text: {text}")
     return text
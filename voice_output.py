@@ -4,9 +4,25 @@ Provides a simple wrapper around ``pyttsx3`` so the agent can speak
 status updates or results to the user.
 """
 
+import threading
 
 from logger import log
 
+# pyttsx3 keeps engines in a weak cache, so without a strong reference every
+# call pays for driver start-up again. Engines are not thread-safe.
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def _get_engine():
+    """Return the shared ``pyttsx3`` engine; call with ``_ENGINE_LOCK`` held."""
+    global _ENGINE
+    if _ENGINE is None:
+        import pyttsx3
+
+        _ENGINE = pyttsx3.init()
+    return _ENGINE
+
 
 def speak(text: str) -> None:
     """Convert ``text`` to speech.
@@ -19,9 +35,9 @@ def speak(text: str) -> None:
 
     log(f"Speak: {text}")
     try:
-        import pyttsx3
-        engine = pyttsx3.init()
-        engine.say(text)
-        engine.runAndWait()
+        with _ENGINE_LOCK:
+            engine = _get_engine()
+            engine.say(text)
+            engine.runAndWait()
     except Exception as exc:  # pragma: no cover - best effort
         log(f"Failed to speak: {exc}", "ERROR")
@@ -1,10 +1,119 @@
 """Simple web search utilities for Ghosthand."""
 
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Tuple
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 from logger import log
 
+try:  # Lexbor parses the whole page in C without building Python objects
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
+try:  # lxml parses incrementally, so the page can be read as it arrives
+    from lxml import etree
+except ImportError:  # pragma: no cover - optional dependency
+    etree = None
+
+_MAX_RESULTS = 3
+_CHUNK_SIZE = 16384
+
+# Used by the BeautifulSoup fallback. While straining, ``class`` is still
+# the raw attribute string (``"result results_links ..."``), so match the
+# token.
+_RESULT_CLASS = re.compile(r"(?:^|\s)result(?:\s|$)")
+
+# One pooled session so consecutive searches reuse the TLS connection.
+# requests already advertises gzip/deflate and decodes them in C.
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Agent loops often repeat a search within seconds; recent successful
+# results are served from memory, least recently used evicted first.
+SEARCH_TTL = 300.0
+_CACHE_MAX = 128
+_CACHE: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _clean(text: str) -> str:
+    """Collapse whitespace so every parser backend yields the same snippet."""
+    return " ".join(text.split())
+
+
+def _parse_stream(chunks: Iterable[bytes]) -> Tuple[List[str], List[str]]:
+    """Collect links and snippets from result blocks as ``chunks`` arrive.
+
+    Parsing stops once the result holding the last wanted link has closed,
+    so the rest of the page is never parsed.
+    """
+    parser = etree.HTMLPullParser(events=("end",), encoding="utf-8")
+    links: List[str] = []
+    snippets: List[str] = []
+
+    def consume() -> bool:
+        for _, el in parser.read_events():
+            classes = (el.get("class") or "").split()
+            if el.tag == "a" and "result__a" in classes:
+                links.append(el.get("href"))
+            elif "result__snippet" in classes:
+                snippets.append(_clean("".join(el.itertext())))
+            elif el.tag == "div" and "result" in classes:
+                el.clear()
+                if len(links) >= _MAX_RESULTS:
+                    return True
+        return False
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        if consume():
+            return links, snippets
+    parser.close()
+    consume()
+    return links, snippets
+
+
+def _parse_lexbor(html: bytes) -> Tuple[List[str], List[str]]:
+    """Collect links and snippets from the first result blocks with Lexbor."""
+    links: List[str] = []
+    snippets: List[str] = []
+    for res in LexborHTMLParser(html).css("div.result"):
+        link = res.css_first("a.result__a")
+        if link is not None:
+            links.append(link.attributes.get("href"))
+        snippet = res.css_first(".result__snippet")
+        if snippet is not None:
+            snippets.append(_clean(snippet.text()))
+        if len(links) >= _MAX_RESULTS:
+            break
+    return links, snippets
+
+
+def _parse_soup(html: str) -> Tuple[List[str], List[str]]:
+    """BeautifulSoup fallback when neither selectolax nor lxml is installed."""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("div", class_=_RESULT_CLASS))
+    links: List[str] = []
+    snippets: List[str] = []
+    for res in soup.find_all("div", class_="result"):
+        link_tag = res.find("a", class_="result__a")
+        if link_tag:
+            links.append(link_tag.get("href"))
+        snippet = res.find(class_="result__snippet")
+        if snippet:
+            snippets.append(_clean(snippet.get_text()))
+        if len(links) >= _MAX_RESULTS:
+            break
+    return links, snippets
+
 
 def search_web(query: str) -> dict:
     """Search the web and return a short summary and top links.
@@ -19,29 +128,37 @@ def search_web(query: str) -> dict:
     dict
         Dictionary with ``summary`` text and a list of ``top_links``.
     """
+    key = query.strip()
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit and now - hit[0] < SEARCH_TTL:
+            _CACHE.move_to_end(key)
+            log(f"Web search cache hit for '{query}'", "WEB")
+            return {"summary": hit[1]["summary"], "top_links": list(hit[1]["top_links"])}
+
     log(f"Searching the web for '{query}'", "WEB")
     try:
-        resp = requests.get(
+        with _SESSION.get(
             "https://duckduckgo.com/html/",
             params={"q": query},
             timeout=30,
-            headers={"User-Agent": "Mozilla/5.0"},
-        )
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        links = []
-        snippets = []
-        for res in soup.select(".result"):
-            link_tag = res.find("a", class_="result__a")
-            if link_tag:
-                links.append(link_tag.get("href"))
-            snippet = res.find(class_="result__snippet")
-            if snippet:
-                snippets.append(snippet.get_text(strip=True))
-            if len(links) >= 3:
-                break
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            if LexborHTMLParser is not None:
+                links, snippets = _parse_lexbor(resp.content)
+            elif etree is not None:
+                links, snippets = _parse_stream(resp.iter_content(_CHUNK_SIZE))
+            else:
+                links, snippets = _parse_soup(resp.text)
         summary = " ".join(snippets)[:200]
         log(f"Web search returned {len(links)} links", "WEB")
+        with _CACHE_LOCK:
+            _CACHE[key] = (now, {"summary": summary, "top_links": list(links)})
+            _CACHE.move_to_end(key)
+            while len(_CACHE) > _CACHE_MAX:
+                _CACHE.popitem(last=False)
         return {"summary": summary, "top_links": links}
     except Exception as exc:  # pragma: no cover - network dependent
         log(f"Web search failed: {exc}", "ERROR")